@@ -389,8 +389,8 @@ def login():
             return render_template('login.html')
         
         try:
-            user = user_profile_manager.get_user_by_username(username)
-            
+            user = user_profile_manager.get_user_for_login(username)
+
             if user and user_profile_manager.verify_password(user, password):
                 # Successful login
                 session['user_id'] = str(user['_id'])
@@ -455,7 +455,7 @@ def signup():
                 flash('Username already taken.', 'error')
                 return render_template('signup.html')
             
-            if mongo.db.users.find_one({'email': email}):
+            if mongo.db.users.find_one({'email': email}, collation={'locale': 'en', 'strength': 2}):
                 logger.info(f"Signup attempt with existing email: {email}")
                 flash('Email already registered.', 'error')
                 return render_template('signup.html')
@@ -1078,7 +1078,10 @@ def profile_edit():
                     flash('Username already taken by another user.', 'error')
                     return render_template('profile_edit.html', user=user)
                 
-                existing_email = mongo.db.users.find_one({'email': email, '_id': {'$ne': user['_id']}})
+                existing_email = mongo.db.users.find_one(
+                    {'email': email, '_id': {'$ne': user['_id']}},
+                    collation={'locale': 'en', 'strength': 2}
+                )
                 if existing_email:
                     flash('Email already registered by another user.', 'error')
                     return render_template('profile_edit.html', user=user)
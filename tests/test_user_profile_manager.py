@@ -108,22 +108,22 @@ def test_user_history_tracking():
     # Test history update
     profile_manager.update_user_history(test_user_id, visited_place, 5)
     
-    # Verify MongoDB update calls
-    assert mock_users.update_one.called
-    
-    # Check the update call for visited places
-    update_calls = mock_users.update_one.call_args_list
-    assert len(update_calls) >= 1
-    
-    # Verify the structure of the update
-    first_call = update_calls[0]
-    filter_doc = first_call[0][0]
-    update_doc = first_call[0][1]
-    
+    # Verify the batched MongoDB write
+    assert mock_users.bulk_write.called
+
+    # Check the bulk operations for visited places
+    operations = mock_users.bulk_write.call_args[0][0]
+    assert len(operations) >= 1
+
+    # Verify the structure of the push operation
+    update_doc = operations[0]._doc
+
     assert "$push" in update_doc
     assert "history.visited_places" in update_doc["$push"]
-    
-    place_entry = update_doc["$push"]["history.visited_places"]
+
+    push_spec = update_doc["$push"]["history.visited_places"]
+    assert push_spec["$slice"] < 0  # History is capped to the most recent entries
+    place_entry = push_spec["$each"][0]
     assert place_entry["name"] == "Myeongdong Street Food"
     assert place_entry["rating"] == 5
     assert "visited_date" in place_entry
@@ -236,26 +236,27 @@ def test_recommendation_weights_update():
     
     # Verify MongoDB update calls
     assert mock_users.update_one.called
-    
-    # Check for increment operation
+
+    # Check for the pipeline update on the food weight
     update_calls = mock_users.update_one.call_args_list
-    increment_call = None
-    
+    weight_key = "personalization.recommendation_weights.food"
+    weight_expr = None
+
     for call in update_calls:
         update_doc = call[0][1]
-        if "$inc" in update_doc:
-            increment_call = update_doc
+        if isinstance(update_doc, list) and weight_key in update_doc[0].get("$set", {}):
+            weight_expr = update_doc[0]["$set"][weight_key]
             break
-    
-    assert increment_call is not None
-    assert "$inc" in increment_call
-    
-    # Verify the weight adjustment
-    weight_key = "personalization.recommendation_weights.food"
-    assert weight_key in increment_call["$inc"]
-    
+
+    assert weight_expr is not None
+
+    # Verify the clamp bounds around the decayed-and-adjusted weight
+    assert weight_expr["$max"][0] == 0.1
+    clamped = weight_expr["$max"][1]
+    assert clamped["$min"][0] == 2.0
+
     # High rating (5) should increase weight
-    adjustment = increment_call["$inc"][weight_key]
+    adjustment = clamped["$min"][1]["$add"][1]
     assert adjustment > 0  # Should be positive for rating > 3
     
     print("✓ Recommendation weights update: PASSED")
@@ -284,11 +285,11 @@ def test_immediate_profile_update_reflection():
     # Verify MongoDB update was called
     assert mock_users.update_one.called
     
-    # Verify cache clear was called
-    assert mock_cache.delete_many.called
-    
-    # Check the update structure
+    # Verify cached recommendations were invalidated via the epoch bump
     update_call = mock_users.update_one.call_args
+    assert update_call[0][1]["$inc"]["personalization.cache_epoch"] == 1
+
+    # Check the update structure
     update_doc = update_call[0][1]["$set"]
     
     # Verify immediate timestamp update
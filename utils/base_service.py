@@ -3,16 +3,28 @@ Base service class with circuit breaker pattern and retry logic for API integrat
 Implements resilience patterns for external API calls.
 """
 import time
+import asyncio
 import logging
 from enum import Enum
 from typing import Any, Callable, Optional
-from functools import wraps
+from functools import cache, wraps
+from dotenv import load_dotenv
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@cache
+def ensure_env_loaded() -> None:
+    """Load variables from .env at most once per process.
+
+    Calling load_dotenv at module import repeats the disk read and parse in
+    every worker; caching here keeps it to a single read, on first use.
+    """
+    load_dotenv()
+
+
 class CircuitState(Enum):
     CLOSED = "closed"
     OPEN = "open"
@@ -92,10 +104,41 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0, backoff_fa
     return decorator
 
 
+def retry_with_backoff_async(max_retries: int = 3, base_delay: float = 1.0, backoff_factor: float = 2.0):
+    """Async variant of retry_with_backoff using asyncio.sleep between attempts."""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            last_exception = None
+
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    last_exception = e
+
+                    if attempt == max_retries:
+                        logger.error(f"Function {func.__name__} failed after {max_retries + 1} attempts: {e}")
+                        raise e
+
+                    delay = base_delay * (backoff_factor ** attempt)
+                    logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {delay}s...")
+                    await asyncio.sleep(delay)
+
+            raise last_exception
+        return wrapper
+    return decorator
+
+
 class BaseService:
     """Base class for all API service integrations."""
-    
+
+    # Subclasses that declare their own __slots__ stay dict-less; the rest
+    # keep a per-instance __dict__ as before
+    __slots__ = ('service_name', 'api_key', 'circuit_breaker', 'logger')
+
     def __init__(self, service_name: str, api_key: Optional[str] = None):
+        ensure_env_loaded()
         self.service_name = service_name
         self.api_key = api_key
         self.circuit_breaker = CircuitBreaker()
@@ -4,34 +4,69 @@ Enhanced with circuit breaker pattern and retry logic for resilience.
 """
 import google.generativeai as genai
 import os
+import asyncio
+import concurrent.futures
 import markdown as md
 from typing import Optional, Dict, Any
-from .base_service import BaseService, retry_with_backoff
-from dotenv import load_dotenv
-load_dotenv()
+from .base_service import BaseService, ensure_env_loaded, retry_with_backoff, retry_with_backoff_async
 
-# Set your Gemini API key here or via environment variable
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+# Key lookup and SDK configuration are deferred to first use so importing
+# this module never reads .env from disk or configures the client; the
+# shared model below still means every service reuses one underlying HTTP
+# channel and its warm keep-alive connections
+_MODEL = None
 
-genai.configure(api_key=GEMINI_API_KEY)
 
-# Use Gemini 2.5 Flash model for faster responses
-MODEL = genai.GenerativeModel('gemini-2.5-flash')
+def _default_api_key() -> Optional[str]:
+    """Resolve the Gemini API key from the (lazily loaded) environment."""
+    ensure_env_loaded()
+    return os.getenv('GEMINI_API_KEY')
+
+
+def _default_model():
+    """Shared GenerativeModel, configured with the default key on first use."""
+    global _MODEL
+    if _MODEL is None:
+        genai.configure(api_key=_default_api_key())
+        _MODEL = genai.GenerativeModel('gemini-2.5-flash')
+    return _MODEL
 
 
 class GeminiService(BaseService):
     """Gemini API service for natural language response generation."""
     
     def __init__(self, api_key: Optional[str] = None):
-        api_key = api_key or GEMINI_API_KEY
+        default_key = _default_api_key()
+        api_key = api_key or default_key
         super().__init__("Gemini", api_key)
-        
-        if api_key:
+
+        if api_key and api_key != default_key:
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel('gemini-2.5-flash')
         else:
-            self.model = MODEL
-    
+            # Reuse the module-level model so every service shares one
+            # underlying HTTP channel and its warm keep-alive connections
+            self.model = _default_model()
+
+        # Thread pool for running the sync SDK entry points from async code
+        # without blocking the event loop for the full round-trip
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='gemini'
+        )
+
+    async def arun_blocking(self, func, *args):
+        """Run a blocking SDK call on the service's thread pool.
+
+        Generation has a native async path (_agenerate_content); this covers
+        the remaining sync entry points when they are called from a coroutine,
+        keeping the event loop free during the Gemini round-trip.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def aextract_entity_with_context(self, question: str) -> Dict[str, Any]:
+        """Async wrapper for extract_entity_with_context via the thread pool."""
+        return await self.arun_blocking(self.extract_entity_with_context, question)
+
     @retry_with_backoff(max_retries=3, base_delay=1.0)
     def _generate_content(self, prompt: str) -> str:
         """Generate content using Gemini API with retry logic."""
@@ -43,7 +78,32 @@ class GeminiService(BaseService):
             raise ValueError("Empty response from Gemini API")
         
         return response.text.strip()
-    
+
+    def _generate_content_stream(self, prompt: str):
+        """Yield response text chunks as Gemini produces them.
+
+        Streaming lets callers start formatting and flushing output while the
+        rest of the completion is still being generated.
+        """
+        if not self.api_key:
+            raise ValueError("Gemini API key not configured")
+
+        for chunk in self.model.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+    @retry_with_backoff_async(max_retries=3, base_delay=1.0)
+    async def _agenerate_content(self, prompt: str) -> str:
+        """Async counterpart of _generate_content so concurrent callers overlap their round-trips."""
+        if not self.api_key:
+            raise ValueError("Gemini API key not configured")
+
+        response = await self.model.generate_content_async(prompt)
+        if not response.text:
+            raise ValueError("Empty response from Gemini API")
+
+        return response.text.strip()
+
     def generate_local_guide_response(self, user_question: str, recommendations: list, 
                                     cultural_context: Optional[str] = None) -> str:
         """
@@ -198,7 +258,7 @@ def extract_entity(question):
     Only return the entity name, nothing else.
     Question: {question}
     """
-    response = MODEL.generate_content(prompt)
+    response = _default_model().generate_content(prompt)
     entity = response.text.strip().split('\n')[0]
     return entity
 
@@ -217,7 +277,7 @@ def generate_reply(question, qloo_data):
     - Make the answer sound natural and conversational, as if you are a knowledgeable local guide.
     - If the recommendations are empty or not relevant, politely inform the user and suggest how they might rephrase their question.
     """
-    response = MODEL.generate_content(prompt)
+    response = _default_model().generate_content(prompt)
     return markdown_to_html(response.text.strip()) 
 
 
@@ -226,14 +286,26 @@ def markdown_to_html(text):
     return md.markdown(text, extensions=['extra', 'sane_lists', 'smarty'])
 
 
+# Shared service for the legacy module-level helpers, created lazily so the
+# connection pool and circuit breaker persist across calls instead of being
+# rebuilt per request
+_default_service = None
+
+
+def _get_default_service() -> 'GeminiService':
+    global _default_service
+    if _default_service is None:
+        _default_service = GeminiService()
+    return _default_service
+
+
 # Legacy compatibility functions for existing app.py
 def extract_entity(question):
     """
     Legacy compatibility function for existing app.py.
     Use Gemini to extract the main entity from the user's question.
     """
-    service = GeminiService()
-    result = service.extract_entity_with_context(question)
+    result = _get_default_service().extract_entity_with_context(question)
     return result.get('entity', '')
 
 
@@ -242,5 +314,4 @@ def generate_reply(question, qloo_data):
     Legacy compatibility function for existing app.py.
     Use Gemini to generate a contextual, conversational reply.
     """
-    service = GeminiService()
-    return service.generate_local_guide_response(question, qloo_data)
\ No newline at end of file
+    return _get_default_service().generate_local_guide_response(question, qloo_data)
\ No newline at end of file
@@ -3,6 +3,14 @@ Local Guide System orchestration for authentic Korean cultural recommendations.
 Coordinates all services to provide culturally authentic Korean travel advice.
 """
 import os
+import re
+import json
+import time
+import string
+import hashlib
+import tempfile
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Tuple
 from .base_service import BaseService
 from .tastedive_api import CulturalDiscoveryEngine
@@ -13,6 +21,91 @@ from .response_generator import ResponseGenerator
 from .user_profile_manager import UserProfileManager
 
 
+# Semantically related Korean terms for common user interests and preferences.
+# Lets personalization match recs that describe an interest without repeating
+# the literal phrase (e.g. "korean bbq" -> a "galbi restaurant" teaser).
+RELATED_INTEREST_TERMS = {
+    'korean bbq': ('samgyeopsal', 'galbi', 'bulgogi', 'gogi'),
+    'bbq': ('samgyeopsal', 'galbi', 'bulgogi'),
+    'food': ('cuisine', 'dining', 'restaurant', 'dish', 'street food'),
+    'street food': ('tteokbokki', 'hotteok', 'pojangmacha', 'food stall'),
+    'k-pop': ('kpop', 'idol', 'korean pop', 'korean wave', 'hallyu'),
+    'kpop': ('k-pop', 'idol', 'korean pop', 'hallyu'),
+    'music': ('concert', 'song', 'band', 'performance'),
+    'nightlife': ('bar', 'club', 'night', 'drinks'),
+    'shopping': ('market', 'store', 'boutique', 'cosmetics'),
+    'history': ('historic', 'heritage', 'palace', 'dynasty'),
+    'traditional': ('heritage', 'hanbok', 'hanok', 'folk'),
+    'tea': ('tea house', 'tea ceremony', 'teahouse'),
+    'temple': ('buddhist', 'temple stay', 'monastery'),
+    'nature': ('park', 'hiking', 'mountain', 'river'),
+    'art': ('gallery', 'museum', 'crafts', 'artisan')
+}
+
+# Recommendation cache lifetime - Korean neighborhood info changes slowly
+RECOMMENDATION_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Maximum in-memory recommendation cache entries; keys include the full
+# profile history, so without a cap distinct users and queries would pin
+# complete result payloads for the whole TTL
+RECOMMENDATION_CACHE_MAX_ENTRIES = 256
+
+# How long a get_status aggregate may be served from cache
+STATUS_CACHE_TTL_SECONDS = 1.0
+
+
+# Precompiled keyword sets and patterns for fallback intent analysis
+_RESTAURANT_KEYWORDS = frozenset(('eat', 'food', 'restaurant', 'dining'))
+_ATTRACTION_KEYWORDS = frozenset(('visit', 'see', 'attraction', 'place'))
+_ENTERTAINMENT_KEYWORDS = frozenset(('music', 'movie', 'show', 'entertainment'))
+_WORD_RE = re.compile(r'[a-z]+')
+_ENTITY_RE = re.compile(r'[A-Za-z]{4,}')
+
+
+def _s(value: Any, default: str = '') -> str:
+    """Coerce a possibly-None value to a string, falling back to a default."""
+    if value is None:
+        return default
+    # Fast path: skip the str() call for the common already-a-string case
+    return value if type(value) is str else str(value)
+
+# Shared literals, interned once instead of duplicated across methods
+_HELLO = '안녕하세요! (Hello!)'
+_PLACE_EMOJI = '🏮'
+_EXPERIENCE_EMOJI = '🎭'
+_TIP_EMOJI = '💡'
+
+# Static fallback HTML, built once at import time instead of per call
+_NO_RECOMMENDATIONS_TEMPLATE = string.Template(f"""
+            <div class="local-guide-response">
+                <p>{_HELLO} As your Korean local guide, I'd love to help you explore authentic Korean culture.</p>
+                <p>For your question about Korean experiences, I recommend exploring these neighborhoods:</p>
+                <ul>
+                    <li><strong>Hongdae</strong> - Youth culture and nightlife</li>
+                    <li><strong>Myeongdong</strong> - Shopping and street food</li>
+                    <li><strong>Itaewon</strong> - International district</li>
+                    <li><strong>Insadong</strong> - Traditional arts and tea culture</li>
+                </ul>
+                <p><em>Cultural tip: $cultural_tip</em></p>
+            </div>
+            """)
+
+_MULTI_FAILURE_FALLBACK_HTML = f"""
+            <div class="local-guide-fallback">
+                <p>{_HELLO} I'm your Korean local guide, and while some of my services are temporarily unavailable,
+                I can still share authentic Korean cultural insights with you.</p>
+                <p>Here are some timeless Korean experiences I always recommend:</p>
+                <ul>
+                    <li><strong>Traditional Markets</strong> - Visit Namdaemun or Dongdaemun for authentic Korean shopping</li>
+                    <li><strong>Korean BBQ</strong> - Try samgyeopsal (pork belly) - it's a social experience, not just a meal</li>
+                    <li><strong>Temple Stay</strong> - Experience Korean Buddhist culture at Jogyesa Temple</li>
+                    <li><strong>Hanbok Experience</strong> - Rent traditional Korean clothing in Bukchon Hanok Village</li>
+                </ul>
+                <p><em>Cultural tip: Remember, tipping is not customary in Korea, and many places close between 3-5 PM!</em></p>
+            </div>
+            """
+
+
 class LocalGuideSystem(BaseService):
     """
     AI-powered Korean local guide system that orchestrates all services.
@@ -25,6 +118,15 @@ class LocalGuideSystem(BaseService):
     - User Profile Manager for personalization
     """
     
+    # Coordinated service attributes reported by get_status, with precomputed
+    # payloads for services that failed to initialize
+    _SERVICE_ATTRS = ('cultural_engine', 'search_service', 'map_service',
+                      'response_generator', 'gemini_service')
+    _UNAVAILABLE_STATUSES = {
+        attr: {'service': attr, 'state': 'unavailable', 'available': False}
+        for attr in _SERVICE_ATTRS
+    }
+
     def __init__(self, user_profile_manager: Optional[UserProfileManager] = None):
         super().__init__("LocalGuideSystem")
         
@@ -39,9 +141,63 @@ class LocalGuideSystem(BaseService):
         # Korean cultural context from product.md
         self.korean_cultural_context = self._initialize_korean_cultural_context()
         
-        # Seoul neighborhood insights for specific recommendations
-        self.neighborhood_insights = self._initialize_neighborhood_insights()
+        # Seoul neighborhood insights for specific recommendations.
+        # Frozen as a read-only view so handle_fallback can hand out the
+        # mapping by reference without defensive copying.
+        self.neighborhood_insights = MappingProxyType(self._initialize_neighborhood_insights())
+
+        # Memo of neighborhood-key sets -> relevant insights subsets; the
+        # insights table is static for the lifetime of the instance
+        self._relevant_insights_memo = {}
+
+        # Short-lived status cache so status polls don't fan out every time
+        self._status_cache = None
+
+        # Precomputed fallback recommendations and response, built once here
+        # instead of on every failed recommendation attempt
+        self._fallback_recommendations = (
+            {
+                'Name': 'Gyeongbokgung Palace',
+                'Type': 'attraction',
+                'cultural_context': 'Historic royal palace showcasing traditional Korean architecture',
+                'neighborhood': 'jongno',
+                'authenticity_score': 0.9,
+                'source': 'fallback'
+            },
+            {
+                'Name': 'Hongdae Street Food',
+                'Type': 'food',
+                'cultural_context': 'Authentic Korean street food experience in youth culture district',
+                'neighborhood': 'hongdae',
+                'authenticity_score': 0.8,
+                'source': 'fallback'
+            },
+            {
+                'Name': 'Insadong Traditional Tea House',
+                'Type': 'experience',
+                'cultural_context': 'Traditional Korean tea ceremony and cultural experience',
+                'neighborhood': 'insadong',
+                'authenticity_score': 0.9,
+                'source': 'fallback'
+            }
+        )
+        self._fallback_response_html = self._generate_fallback_response(
+            '', list(self._fallback_recommendations),
+            [self.korean_cultural_context['cultural_norms']['tipping']]
+        )
         
+        # Disk-backed recommendation cache so warm results survive restarts;
+        # the in-memory layer is a capped LRU like the other service caches
+        self._response_cache = OrderedDict()
+        self._cache_dir = os.getenv('LOCAL_GUIDE_CACHE_DIR') or os.path.join(
+            tempfile.gettempdir(), 'local_guide_cache'
+        )
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Recommendation cache directory unavailable: {e}")
+            self._cache_dir = None
+
         # Authentic experience prioritization weights
         self.authenticity_weights = {
             'traditional': 1.0,
@@ -145,6 +301,12 @@ class LocalGuideSystem(BaseService):
             Comprehensive recommendation response with cultural context
         """
         try:
+            # Check cache first - warm results survive process restarts
+            cache_key = self._recommendation_cache_key(user_query, user_profile, location)
+            cached_result = self._get_cached_recommendation(cache_key)
+            if cached_result is not None:
+                return cached_result
+
             # Step 1: Analyze user intent and extract cultural context
             intent_analysis = self._analyze_user_intent(user_query)
             
@@ -163,11 +325,11 @@ class LocalGuideSystem(BaseService):
             enriched_recommendations = self._add_neighborhood_insights(prioritized_recommendations)
             
             # Step 6: Generate natural language response with cultural context
-            response = self._generate_cultural_response(
+            response, response_from_gemini = self._generate_cultural_response(
                 user_query, enriched_recommendations, intent_analysis, personalization_context
             )
-            
-            return {
+
+            result = {
                 'response': response,
                 'recommendations': enriched_recommendations,
                 'cultural_context': intent_analysis.get('cultural_themes', []),
@@ -175,11 +337,95 @@ class LocalGuideSystem(BaseService):
                 'authenticity_score': self._calculate_overall_authenticity_score(enriched_recommendations),
                 'personalization_applied': bool(personalization_context)
             }
-            
+
+            # Cache only complete results: an empty recommendation set or
+            # fallback HTML reflects an upstream outage and must not
+            # outlive it, let alone survive restarts via the disk store
+            if enriched_recommendations and response_from_gemini:
+                self._store_cached_recommendation(cache_key, result)
+            return result
+
         except Exception as e:
             self.logger.error(f"Error generating recommendation for '{user_query}': {e}")
             return self._handle_recommendation_fallback(user_query, user_profile)
-    
+
+    def _recommendation_cache_key(self, user_query: str, user_profile: Optional[Dict[str, Any]],
+                                  location: Optional[Tuple[float, float]]) -> str:
+        """Build a stable cache key from the normalized query, profile and location.
+
+        Every profile field that feeds personalization goes into the key —
+        preferences, visited places, favorites and preferred neighborhoods —
+        so users with similar preferences never share an entry and a user's
+        own entry turns over as soon as their history changes.
+        """
+        normalized_query = ' '.join(user_query.lower().split())
+        profile = user_profile or {}
+        history = profile.get('history', {})
+        key_source = json.dumps(
+            [
+                normalized_query,
+                profile.get('preferences', {}),
+                [place.get('name') for place in history.get('visited_places', [])],
+                [fav.get('name') for fav in history.get('favorites', [])],
+                profile.get('personalization', {}).get('preferred_neighborhoods', []),
+                location
+            ],
+            sort_keys=True, default=str
+        )
+        return hashlib.md5(key_source.encode()).hexdigest()
+
+    def _get_cached_recommendation(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached recommendation in memory, then on disk. Never raises."""
+        now = time.time()
+
+        # In-memory first
+        entry = self._response_cache.get(cache_key)
+        if entry:
+            created_at, result = entry
+            if now - created_at < RECOMMENDATION_CACHE_TTL_SECONDS:
+                self._response_cache.move_to_end(cache_key)
+                return result
+            del self._response_cache[cache_key]
+
+        # Disk-backed store survives process restarts
+        if not self._cache_dir:
+            return None
+        cache_path = os.path.join(self._cache_dir, f"{cache_key}.json")
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                entry = json.load(cache_file)
+            if now - entry.get('created_at', 0) < RECOMMENDATION_CACHE_TTL_SECONDS:
+                result = entry['result']
+                self._cache_in_memory(cache_key, entry['created_at'], result)
+                return result
+            os.remove(cache_path)  # Evict expired entries lazily
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Recommendation cache read failed: {e}")
+
+        return None
+
+    def _cache_in_memory(self, cache_key: str, created_at: float, result: Dict[str, Any]):
+        """Store an entry in the in-memory layer, evicting the least recently used."""
+        self._response_cache[cache_key] = (created_at, result)
+        if len(self._response_cache) > RECOMMENDATION_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+    def _store_cached_recommendation(self, cache_key: str, result: Dict[str, Any]):
+        """Store a recommendation in memory and on disk. Cache failure never breaks a request."""
+        created_at = time.time()
+        self._cache_in_memory(cache_key, created_at, result)
+
+        if not self._cache_dir:
+            return
+        cache_path = os.path.join(self._cache_dir, f"{cache_key}.json")
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'created_at': created_at, 'result': result}, cache_file, default=str)
+        except Exception as e:
+            self.logger.warning(f"Recommendation cache write failed: {e}")
+
     def _analyze_user_intent(self, user_query: str) -> Dict[str, Any]:
         """Analyze user intent and extract cultural themes."""
         # Use ResponseGenerator's Gemini service for intent analysis if available
@@ -283,7 +529,7 @@ class LocalGuideSystem(BaseService):
                                           location: Optional[Tuple[float, float]]) -> List[Dict[str, Any]]:
         """Coordinate all services to generate comprehensive recommendations."""
         all_recommendations = []
-        
+
         # Get cultural recommendations from TasteDive
         if self.cultural_engine and self.cultural_engine.is_available():
             try:
@@ -291,28 +537,30 @@ class LocalGuideSystem(BaseService):
                     user_query, content_type="all", limit=8
                 )
                 for rec in cultural_recs:
+                    self._normalize_rec(rec)
                     rec['source'] = 'cultural_discovery'
                     rec['recommendation_type'] = 'cultural_experience'
                 all_recommendations.extend(cultural_recs)
             except Exception as e:
                 self.logger.warning(f"Cultural discovery failed: {e}")
-        
+
         # Get place recommendations from search service
         if self.search_service and self.search_service.is_available():
             try:
                 # Default to Seoul center if no location provided
                 search_location = location or (37.5665, 126.9780)
-                
+
                 place_recs = self.search_service.search_places(
                     user_query, location=search_location, place_type=None
                 )
                 for rec in place_recs:
+                    self._normalize_rec(rec)
                     rec['source'] = 'search_service'
                     rec['recommendation_type'] = 'place'
                 all_recommendations.extend(place_recs[:6])  # Limit place results
             except Exception as e:
                 self.logger.warning(f"Search service failed: {e}")
-        
+
         # Get neighborhood-specific recommendations if neighborhood detected
         neighborhood_focus = intent_analysis.get('neighborhood_focus')
         if neighborhood_focus and self.search_service:
@@ -321,6 +569,7 @@ class LocalGuideSystem(BaseService):
                     neighborhood_focus, place_type=None
                 )
                 for rec in neighborhood_recs:
+                    self._normalize_rec(rec)
                     rec['source'] = 'neighborhood_search'
                     rec['recommendation_type'] = 'neighborhood_place'
                 all_recommendations.extend(neighborhood_recs[:4])  # Limit neighborhood results
@@ -334,17 +583,46 @@ class LocalGuideSystem(BaseService):
             )
         
         return all_recommendations
-    
+
+    def _normalize_rec(self, rec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize a recommendation in place at the service boundary.
+
+        Coerces the text fields to strings (empty if missing/None) and
+        cultural_tags to a list of strings so downstream scoring can access
+        fields directly without defensive None checks.
+        """
+        if not rec.get('Name') and rec.get('name'):
+            rec['Name'] = rec['name']
+
+        for field in ('Name', 'wTeaser', 'description', 'cultural_context', 'neighborhood'):
+            value = rec.get(field)
+            rec[field] = str(value) if value is not None else ''
+
+        cultural_tags = rec.get('cultural_tags')
+        if not isinstance(cultural_tags, list):
+            cultural_tags = []
+        rec['cultural_tags'] = [str(tag) for tag in cultural_tags if tag is not None]
+
+        return rec
+
     def _apply_personalization_filtering(self, recommendations: List[Dict[str, Any]],
                                        personalization_context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Apply personalization filtering based on user preferences and history."""
         filtered_recommendations = []
-        
-        user_interests = set(personalization_context.get('interests', []))
+
         visited_places = set(personalization_context.get('visited_places', []))
         food_restrictions = personalization_context.get('food_restrictions', [])
-        cultural_preferences = set(personalization_context.get('cultural_preferences', []))
-        
+
+        # Expand interest/preference terms once per request instead of
+        # re-lowercasing them inside the per-recommendation scoring loop
+        interest_term_groups = self._expand_preference_terms(
+            personalization_context.get('interests', [])
+        )
+        cultural_term_groups = self._expand_preference_terms(
+            personalization_context.get('cultural_preferences', [])
+        )
+
         for rec in recommendations:
             # Skip already visited places
             rec_name = rec.get('Name', rec.get('name', ''))
@@ -358,7 +636,7 @@ class LocalGuideSystem(BaseService):
             
             # Boost recommendations matching user interests
             rec['personalization_score'] = self._calculate_personalization_score(
-                rec, user_interests, cultural_preferences
+                rec, interest_term_groups, cultural_term_groups
             )
             
             filtered_recommendations.append(rec)
@@ -372,19 +650,12 @@ class LocalGuideSystem(BaseService):
         """Check if recommendation violates user's food restrictions."""
         if not restrictions:
             return False
-        
-        # Safely get and convert all text fields to strings
-        name = str(recommendation.get('Name', '')) if recommendation.get('Name') is not None else ''
-        teaser = str(recommendation.get('wTeaser', '')) if recommendation.get('wTeaser') is not None else ''
-        description = str(recommendation.get('description', '')) if recommendation.get('description') is not None else ''
-        cultural_tags = recommendation.get('cultural_tags', [])
-        
-        # Ensure cultural_tags is a list and all elements are strings
-        if not isinstance(cultural_tags, list):
-            cultural_tags = []
-        cultural_tags_str = ' '.join(str(tag) for tag in cultural_tags if tag is not None)
-        
-        rec_text = f"{name} {teaser} {description} {cultural_tags_str}".lower()
+
+        # Recs are normalized at the service boundary, so fields are clean strings
+        rec_text = ' '.join((
+            recommendation['Name'], recommendation['wTeaser'],
+            recommendation['description'], *recommendation['cultural_tags']
+        )).lower()
         
         restriction_keywords = {
             'vegetarian': ['meat', 'beef', 'pork', 'chicken', 'fish', 'seafood', 'bbq'],
@@ -402,38 +673,46 @@ class LocalGuideSystem(BaseService):
         
         return False
     
+    def _expand_preference_terms(self, terms: List[str]) -> List[Tuple[str, ...]]:
+        """
+        Expand user interest/preference terms with semantically related Korean terms.
+
+        Returns one tuple of lowercase search terms per original term so that
+        scoring counts each interest at most once, however it is matched.
+        """
+        term_groups = []
+        for term in terms:
+            term_lower = str(term).lower()
+            related = RELATED_INTEREST_TERMS.get(term_lower, ())
+            term_groups.append((term_lower,) + related)
+        return term_groups
+
     def _calculate_personalization_score(self, recommendation: Dict[str, Any],
-                                       user_interests: set, cultural_preferences: set) -> float:
-        """Calculate personalization score based on user preferences."""
+                                       interest_term_groups: List[Tuple[str, ...]],
+                                       cultural_term_groups: List[Tuple[str, ...]]) -> float:
+        """Calculate personalization score based on expanded user preference terms."""
         score = 0.0
-        
-        # Safely get and convert all text fields to strings
-        name = str(recommendation.get('Name', '')) if recommendation.get('Name') is not None else ''
-        teaser = str(recommendation.get('wTeaser', '')) if recommendation.get('wTeaser') is not None else ''
-        description = str(recommendation.get('description', '')) if recommendation.get('description') is not None else ''
-        cultural_tags = recommendation.get('cultural_tags', [])
-        
-        # Ensure cultural_tags is a list and all elements are strings
-        if not isinstance(cultural_tags, list):
-            cultural_tags = []
-        cultural_tags_str = ' '.join(str(tag) for tag in cultural_tags if tag is not None)
-        
-        rec_text = f"{name} {teaser} {description} {cultural_tags_str}".lower()
-        
-        # Interest matching
-        for interest in user_interests:
-            if interest.lower() in rec_text:
+
+        # Recs are normalized at the service boundary, so fields are clean strings
+        rec_text = ' '.join((
+            recommendation['Name'], recommendation['wTeaser'],
+            recommendation['description'], *recommendation['cultural_tags']
+        )).lower()
+
+        # Interest matching (each interest counted once across its related terms)
+        for term_group in interest_term_groups:
+            if any(term in rec_text for term in term_group):
                 score += 0.3
-        
+
         # Cultural preference matching
-        for preference in cultural_preferences:
-            if preference.lower() in rec_text:
+        for term_group in cultural_term_groups:
+            if any(term in rec_text for term in term_group):
                 score += 0.2
-        
+
         # Boost for high cultural relevance
         cultural_relevance = recommendation.get('cultural_relevance', 0)
         score += cultural_relevance * 0.1
-        
+
         return score
     
     def _prioritize_authentic_experiences(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -453,20 +732,13 @@ class LocalGuideSystem(BaseService):
     def _calculate_authenticity_score(self, recommendation: Dict[str, Any]) -> float:
         """Calculate authenticity score based on cultural indicators."""
         score = 0.5  # Base score
-        
-        # Safely get and convert all text fields to strings
-        name = str(recommendation.get('Name', '')) if recommendation.get('Name') is not None else ''
-        teaser = str(recommendation.get('wTeaser', '')) if recommendation.get('wTeaser') is not None else ''
-        description = str(recommendation.get('description', '')) if recommendation.get('description') is not None else ''
-        cultural_context = str(recommendation.get('cultural_context', '')) if recommendation.get('cultural_context') is not None else ''
-        cultural_tags = recommendation.get('cultural_tags', [])
-        
-        # Ensure cultural_tags is a list and all elements are strings
-        if not isinstance(cultural_tags, list):
-            cultural_tags = []
-        cultural_tags_str = ' '.join(str(tag) for tag in cultural_tags if tag is not None)
-        
-        rec_text = f"{name} {teaser} {description} {cultural_context} {cultural_tags_str}".lower()
+
+        # Recs are normalized at the service boundary, so fields are clean strings
+        rec_text = ' '.join((
+            recommendation['Name'], recommendation['wTeaser'],
+            recommendation['description'], recommendation['cultural_context'],
+            *recommendation['cultural_tags']
+        )).lower()
         
         # Apply authenticity weights
         for keyword, weight in self.authenticity_weights.items():
@@ -486,22 +758,13 @@ class LocalGuideSystem(BaseService):
     def _add_neighborhood_insights(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Add neighborhood-specific cultural insights to recommendations."""
         for rec in recommendations:
-            neighborhood = rec.get('neighborhood', '')
-            if neighborhood is None:
-                neighborhood = ''
-            neighborhood = str(neighborhood).lower()
-            
+            neighborhood = rec['neighborhood'].lower()
+
             if neighborhood in self.neighborhood_insights:
                 insights = self.neighborhood_insights[neighborhood]
-                
+
                 # Add neighborhood character
-                existing_context = rec.get('cultural_context', '')
-                if existing_context is None:
-                    existing_context = ''
-                
-                # Ensure existing_context is a string
-                existing_context = str(existing_context)
-                
+                existing_context = rec['cultural_context']
                 if existing_context and not existing_context.endswith('.'):
                     existing_context += '. '
                 elif existing_context:
@@ -521,8 +784,13 @@ class LocalGuideSystem(BaseService):
         return recommendations
     
     def _generate_cultural_response(self, user_query: str, recommendations: List[Dict[str, Any]],
-                                  intent_analysis: Dict[str, Any], personalization_context: Dict[str, Any]) -> str:
-        """Generate natural language response with Korean cultural context."""
+                                  intent_analysis: Dict[str, Any],
+                                  personalization_context: Dict[str, Any]) -> Tuple[str, bool]:
+        """Generate natural language response with Korean cultural context.
+
+        Returns the response HTML and whether Gemini produced it; the caller
+        uses the flag to keep fallback output out of the long-lived cache.
+        """
         # Prepare cultural context for response generation
         cultural_themes = intent_analysis.get('cultural_themes', [])
         neighborhood_focus = intent_analysis.get('neighborhood_focus')
@@ -555,23 +823,31 @@ class LocalGuideSystem(BaseService):
         # Generate response using ResponseGenerator if available
         if self.response_generator and self.response_generator.is_available():
             try:
-                return self.response_generator.generate_response(
+                response = self.response_generator.generate_response(
                     user_query, recommendations, cultural_context_text, personalization_context
                 )
+                # generate_response swallows Gemini failures and returns its
+                # structured fallback instead of raising; the breaker records
+                # each failure, so a clean failure count after the call is
+                # the signal that Gemini really produced this response
+                gemini = self.response_generator.gemini_service
+                return response, bool(gemini and gemini.circuit_breaker.failure_count == 0)
             except Exception as e:
                 self.logger.warning(f"ResponseGenerator failed: {e}")
-        
+
         # Fallback to legacy Gemini service
         if self.gemini_service and self.gemini_service.is_available():
             try:
-                return self.gemini_service.generate_local_guide_response(
+                response = self.gemini_service.generate_local_guide_response(
                     user_query, recommendations, cultural_context_text
                 )
+                # Same swallow-and-fall-back shape as above, same signal
+                return response, self.gemini_service.circuit_breaker.failure_count == 0
             except Exception as e:
                 self.logger.warning(f"Gemini response generation failed: {e}")
-        
+
         # Fallback to structured response
-        return self._generate_fallback_response(user_query, recommendations, cultural_context_elements)
+        return self._generate_fallback_response(user_query, recommendations, cultural_context_elements), False
     
     def _generate_fallback_response(self, user_query: str, recommendations: List[Dict[str, Any]],
                                   cultural_context: List[str]) -> str:
@@ -579,106 +855,96 @@ class LocalGuideSystem(BaseService):
         if not recommendations:
             # Ensure cultural_context has at least one element
             cultural_tip = cultural_context[0] if cultural_context else "Tipping is not customary in South Korea."
-            return f"""
-            <div class="local-guide-response">
-                <p>안녕하세요! (Hello!) As your Korean local guide, I'd love to help you explore authentic Korean culture.</p>
-                <p>For your question about Korean experiences, I recommend exploring these neighborhoods:</p>
-                <ul>
-                    <li><strong>Hongdae</strong> - Youth culture and nightlife</li>
-                    <li><strong>Myeongdong</strong> - Shopping and street food</li>
-                    <li><strong>Itaewon</strong> - International district</li>
-                    <li><strong>Insadong</strong> - Traditional arts and tea culture</li>
-                </ul>
-                <p><em>Cultural tip: {cultural_tip}</em></p>
-            </div>
-            """
-        
-        # Group recommendations by type
-        places = [r for r in recommendations if r.get('recommendation_type') == 'place']
-        experiences = [r for r in recommendations if r.get('recommendation_type') == 'cultural_experience']
-        
-        response_parts = ['<div class="local-guide-response">']
-        response_parts.append('<p>안녕하세요! (Hello!) Here are my authentic Korean recommendations:</p>')
+            return _NO_RECOMMENDATIONS_TEMPLATE.substitute(cultural_tip=cultural_tip)
         
+        # Group recommendations by type in a single pass
+        places, experiences = [], []
+        for rec in recommendations:
+            rec_type = rec.get('recommendation_type')
+            if rec_type == 'place':
+                places.append(rec)
+            elif rec_type == 'cultural_experience':
+                experiences.append(rec)
+
+        places_block = ''
         if places:
-            response_parts.append('<h4>🏮 Places to Visit:</h4>')
-            response_parts.append('<ul>')
-            for place in places[:3]:
-                name = place.get('Name', place.get('name', 'Korean Place'))
-                context = place.get('cultural_context', 'Authentic Korean experience')
-                # Ensure name and context are strings
-                name = str(name) if name is not None else 'Korean Place'
-                context = str(context) if context is not None else 'Authentic Korean experience'
-                response_parts.append(f'<li><strong>{name}</strong> - {context}</li>')
-            response_parts.append('</ul>')
-        
+            items = ''.join([
+                f'<li><strong>{_s(place.get("Name", place.get("name")), "Korean Place")}</strong>'
+                f' - {_s(place.get("cultural_context"), "Authentic Korean experience")}</li>'
+                for place in places[:3]
+            ])
+            places_block = f'<h4>{_PLACE_EMOJI} Places to Visit:</h4><ul>{items}</ul>'
+
+        experiences_block = ''
         if experiences:
-            response_parts.append('<h4>🎭 Cultural Experiences:</h4>')
-            response_parts.append('<ul>')
-            for exp in experiences[:3]:
-                name = exp.get('Name', 'Korean Cultural Experience')
-                teaser = exp.get('wTeaser', 'Authentic Korean cultural activity')
-                # Ensure name and teaser are strings
-                name = str(name) if name is not None else 'Korean Cultural Experience'
-                teaser = str(teaser) if teaser is not None else 'Authentic Korean cultural activity'
-                response_parts.append(f'<li><strong>{name}</strong> - {teaser}</li>')
-            response_parts.append('</ul>')
-        
+            items = ''.join([
+                f'<li><strong>{_s(exp.get("Name"), "Korean Cultural Experience")}</strong>'
+                f' - {_s(exp.get("wTeaser"), "Authentic Korean cultural activity")}</li>'
+                for exp in experiences[:3]
+            ])
+            experiences_block = f'<h4>{_EXPERIENCE_EMOJI} Cultural Experiences:</h4><ul>{items}</ul>'
+
+        tip_block = ''
         if cultural_context:
             cultural_tip = str(cultural_context[0]) if cultural_context[0] is not None else "Tipping is not customary in South Korea."
-            response_parts.append(f'<p><em>💡 Cultural tip: {cultural_tip}</em></p>')
-        
-        response_parts.append('</div>')
-        
-        return ''.join(response_parts)
+            tip_block = f'<p><em>{_TIP_EMOJI} Cultural tip: {cultural_tip}</em></p>'
+
+        return (
+            '<div class="local-guide-response">'
+            f'<p>{_HELLO} Here are my authentic Korean recommendations:</p>'
+            f'{places_block}{experiences_block}{tip_block}</div>'
+        )
     
     def _extract_relevant_neighborhood_insights(self, recommendations: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Extract relevant neighborhood insights from recommendations."""
-        neighborhood_insights = {}
-        
+        """Extract relevant neighborhood insights from recommendations, memoized per key set."""
+        insights = self.neighborhood_insights
+        lowered = {}  # raw -> lowercase, reused for duplicate neighborhoods
+        keys = set()
         for rec in recommendations:
-            neighborhood = rec.get('neighborhood', '')
-            if neighborhood is None:
-                neighborhood = ''
-            neighborhood = str(neighborhood).lower()
-            
-            if neighborhood in self.neighborhood_insights and neighborhood not in neighborhood_insights:
-                neighborhood_insights[neighborhood] = self.neighborhood_insights[neighborhood]
-        
-        return neighborhood_insights
+            raw = rec.get('neighborhood') or ''
+            key = lowered.get(raw)
+            if key is None:
+                key = lowered[raw] = _s(raw).lower()
+            if key in insights:
+                keys.add(key)
+        neighborhoods = frozenset(keys)
+
+        cached = self._relevant_insights_memo.get(neighborhoods)
+        if cached is None:
+            cached = {
+                neighborhood: self.neighborhood_insights[neighborhood]
+                for neighborhood in sorted(neighborhoods)
+            }
+            self._relevant_insights_memo[neighborhoods] = cached
+
+        return cached
     
     def _calculate_overall_authenticity_score(self, recommendations: List[Dict[str, Any]]) -> float:
         """Calculate overall authenticity score for the recommendation set."""
-        if not recommendations:
-            return 0.0
-        
-        total_score = sum(rec.get('authenticity_score', 0) for rec in recommendations)
-        return total_score / len(recommendations)
+        # List comprehension + sum over a flat list avoids generator-frame
+        # overhead for the typical small recommendation set
+        scores = [rec.get('authenticity_score', 0.0) for rec in recommendations]
+        return sum(scores) / len(scores) if scores else 0.0
     
     def _fallback_intent_analysis(self, user_query: str) -> Dict[str, Any]:
         """Fallback intent analysis when Gemini is unavailable."""
-        query_lower = user_query.lower()
-        
-        # Simple keyword-based analysis
-        entity = 'korean culture'
-        intent_type = 'place'
         korean_related = True
-        
-        # Extract potential entity
-        words = user_query.split()
-        for word in words:
-            if len(word) > 3 and word.isalpha():
-                entity = word
-                break
-        
-        # Determine type
-        if any(word in query_lower for word in ['eat', 'food', 'restaurant', 'dining']):
+
+        # Extract potential entity (first alphabetic word of 4+ characters)
+        entity_match = _ENTITY_RE.search(user_query)
+        entity = entity_match.group(0) if entity_match else 'korean culture'
+
+        # Determine type from a single tokenization instead of repeated substring scans
+        tokens = frozenset(_WORD_RE.findall(user_query.lower()))
+        if tokens & _RESTAURANT_KEYWORDS:
             intent_type = 'restaurant'
-        elif any(word in query_lower for word in ['visit', 'see', 'attraction', 'place']):
+        elif tokens & _ATTRACTION_KEYWORDS:
             intent_type = 'attraction'
-        elif any(word in query_lower for word in ['music', 'movie', 'show', 'entertainment']):
+        elif tokens & _ENTERTAINMENT_KEYWORDS:
             intent_type = 'entertainment'
-        
+        else:
+            intent_type = 'place'
+
         return {
             'entity': entity,
             'type': intent_type,
@@ -690,41 +956,11 @@ class LocalGuideSystem(BaseService):
     
     def _handle_recommendation_fallback(self, user_query: str, user_profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Handle fallback when recommendation generation fails."""
-        fallback_recommendations = [
-            {
-                'Name': 'Gyeongbokgung Palace',
-                'Type': 'attraction',
-                'cultural_context': 'Historic royal palace showcasing traditional Korean architecture',
-                'neighborhood': 'jongno',
-                'authenticity_score': 0.9,
-                'source': 'fallback'
-            },
-            {
-                'Name': 'Hongdae Street Food',
-                'Type': 'food',
-                'cultural_context': 'Authentic Korean street food experience in youth culture district',
-                'neighborhood': 'hongdae',
-                'authenticity_score': 0.8,
-                'source': 'fallback'
-            },
-            {
-                'Name': 'Insadong Traditional Tea House',
-                'Type': 'experience',
-                'cultural_context': 'Traditional Korean tea ceremony and cultural experience',
-                'neighborhood': 'insadong',
-                'authenticity_score': 0.9,
-                'source': 'fallback'
-            }
-        ]
-        
-        fallback_response = self._generate_fallback_response(
-            user_query, fallback_recommendations, 
-            [self.korean_cultural_context['cultural_norms']['tipping']]
-        )
-        
         return {
-            'response': fallback_response,
-            'recommendations': fallback_recommendations,
+            'response': self._fallback_response_html,
+            # Shallow copies so callers can annotate recs without corrupting
+            # the precomputed payload
+            'recommendations': [dict(rec) for rec in self._fallback_recommendations],
             'cultural_context': ['general_culture'],
             'neighborhood_insights': {},
             'authenticity_score': 0.8,
@@ -737,20 +973,7 @@ class LocalGuideSystem(BaseService):
         self.logger.warning(f"Multiple service failures: {service_failures}")
         
         return {
-            'response': """
-            <div class="local-guide-fallback">
-                <p>안녕하세요! (Hello!) I'm your Korean local guide, and while some of my services are temporarily unavailable, 
-                I can still share authentic Korean cultural insights with you.</p>
-                <p>Here are some timeless Korean experiences I always recommend:</p>
-                <ul>
-                    <li><strong>Traditional Markets</strong> - Visit Namdaemun or Dongdaemun for authentic Korean shopping</li>
-                    <li><strong>Korean BBQ</strong> - Try samgyeopsal (pork belly) - it's a social experience, not just a meal</li>
-                    <li><strong>Temple Stay</strong> - Experience Korean Buddhist culture at Jogyesa Temple</li>
-                    <li><strong>Hanbok Experience</strong> - Rent traditional Korean clothing in Bukchon Hanok Village</li>
-                </ul>
-                <p><em>Cultural tip: Remember, tipping is not customary in Korea, and many places close between 3-5 PM!</em></p>
-            </div>
-            """,
+            'response': _MULTI_FAILURE_FALLBACK_HTML,
             'recommendations': [],
             'cultural_context': ['traditional_culture', 'food_culture'],
             'neighborhood_insights': self.neighborhood_insights,
@@ -760,34 +983,33 @@ class LocalGuideSystem(BaseService):
             'service_failures': service_failures
         }
     
+    def invalidate_status(self):
+        """Drop the cached status so the next get_status call re-probes services."""
+        self._status_cache = None
+
     def get_status(self) -> Dict[str, Any]:
         """Get status of the Local Guide System and all coordinated services."""
+        # Serve bursts of status polls from a short-lived cache instead of
+        # fanning out to every coordinated service on each call
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < STATUS_CACHE_TTL_SECONDS:
+            return self._status_cache[1]
+
         service_statuses = {}
-        
-        services = {
-            'cultural_engine': self.cultural_engine,
-            'search_service': self.search_service,
-            'map_service': self.map_service,
-            'response_generator': self.response_generator,
-            'gemini_service': self.gemini_service  # Legacy compatibility
-        }
-        
-        for name, service in services.items():
-            if service:
-                service_statuses[name] = service.get_status()
-            else:
-                service_statuses[name] = {
-                    'service': name,
-                    'state': 'unavailable',
-                    'available': False
-                }
-        
+        available_services = 0
+
+        for name in self._SERVICE_ATTRS:
+            service = getattr(self, name)
+            status = service.get_status() if service else self._UNAVAILABLE_STATUSES[name]
+            if status.get('available', False):
+                available_services += 1
+            service_statuses[name] = status
+
         # Calculate overall system health
-        available_services = sum(1 for status in service_statuses.values() if status.get('available', False))
-        total_services = len(service_statuses)
+        total_services = len(self._SERVICE_ATTRS)
         system_health = available_services / total_services if total_services > 0 else 0
         
-        return {
+        status = {
             'service': 'LocalGuideSystem',
             'state': 'healthy' if system_health > 0.5 else 'degraded' if system_health > 0 else 'unavailable',
             'available': system_health > 0,
@@ -795,4 +1017,7 @@ class LocalGuideSystem(BaseService):
             'service_statuses': service_statuses,
             'korean_cultural_context_loaded': bool(self.korean_cultural_context),
             'neighborhood_insights_loaded': bool(self.neighborhood_insights)
-        }
\ No newline at end of file
+        }
+
+        self._status_cache = (now, status)
+        return status
\ No newline at end of file
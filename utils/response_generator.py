@@ -2,14 +2,198 @@
 Response Generator with Gemini integration for natural language response generation.
 Implements Korean-informed language patterns and local guide persona with cultural context.
 """
+import io
 import os
+import re
+import html
+import json
+import time
+import asyncio
+import functools
 import markdown as md
+from collections import OrderedDict, defaultdict
 from typing import Optional, Dict, Any, List
-from .base_service import BaseService, retry_with_backoff
+from .base_service import BaseService
 from .gemini_api import GeminiService
-from dotenv import load_dotenv
 
-load_dotenv()
+# Filler words ignored when canonicalizing queries for the response cache,
+# so near-duplicate phrasings ("Best food in Hongdae?" / "what food is good
+# in hongdae") collapse onto the same cache key
+_QUERY_STOPWORDS = frozenset((
+    'a', 'an', 'the', 'i', 'me', 'my', 'to', 'in', 'at', 'on', 'for', 'of',
+    'is', 'are', 'can', 'could', 'should', 'would', 'do', 'does', 'what',
+    'where', 'which', 'how', 'want', 'like', 'best', 'good', 'some', 'any',
+    'please', 'recommend', 'recommendations', 'suggest', 'suggestions'
+))
+
+# Maximum number of generated responses kept in the LRU cache
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# How long (seconds) a computed status payload stays fresh; shares the env
+# knob with ServiceManager so health-endpoint polling is tuned in one place
+_STATUS_CACHE_TTL = float(os.getenv('SERVICE_STATUS_CACHE_TTL', '1.0'))
+
+
+class _TemplateVars(dict):
+    """Template variables that render missing placeholders as empty strings.
+
+    Used with str.format_map so an unfilled placeholder degrades to an empty
+    section instead of raising KeyError and forcing the emergency fallback.
+    """
+
+    def __missing__(self, key: str) -> str:
+        return ''
+
+# Word extractor used to canonicalize queries, dropping punctuation so
+# "Hongdae?" and "hongdae" map to the same token
+_QUERY_WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Keyword tables for query classification, built once at import time so the
+# hot paths scan a tokenized query against frozensets instead of rebuilding
+# keyword lists and running substring checks per call
+_TIPPING_WORDS = frozenset(('tip', 'tips', 'tipping', 'money', 'pay', 'paying'))
+_TIMING_WORDS = frozenset(('time', 'times', 'when', 'schedule', 'hours'))
+_TRANSPORT_WORDS = frozenset(('transport', 'taxi', 'taxis', 'subway', 'bus', 'buses', 'travel'))
+_FOOD_WORDS = frozenset(('food', 'foods', 'eat', 'eating', 'restaurant', 'restaurants', 'dining', 'cuisine'))
+_BBQ_WORDS = frozenset(('bbq', 'samgyeopsal', 'pork'))
+_CULTURE_WORDS = frozenset((
+    'culture', 'cultural', 'traditional', 'experience', 'experiences',
+    'activity', 'activities', 'temple', 'temples', 'palace', 'palaces'
+))
+_NEIGHBORHOOD_NAMES = frozenset(('hongdae', 'myeongdong', 'itaewon', 'gangnam', 'insadong', 'jongno'))
+
+# Combined token -> tag table so one pass over the query tokens yields every
+# category at once, instead of each consumer re-scanning its own keyword set
+_KEYWORD_TO_TAG = {}
+for _words, _tag in (
+    (_TIPPING_WORDS, 'tipping'),
+    (_TIMING_WORDS, 'timing'),
+    (_TRANSPORT_WORDS, 'transport'),
+    (_FOOD_WORDS, 'food'),
+    (_BBQ_WORDS, 'bbq'),
+    (_CULTURE_WORDS, 'culture'),
+    (_NEIGHBORHOOD_NAMES, 'neighborhood'),
+):
+    for _word in _words:
+        _KEYWORD_TO_TAG[_word] = _tag
+del _words, _tag, _word
+
+
+@functools.lru_cache(maxsize=2048)
+def _esc_str(value: str) -> str:
+    return html.escape(value, quote=False)
+
+
+def _esc(value: Any) -> str:
+    """Escape untrusted text for HTML interpolation.
+
+    Cached for strings because recommendation names and descriptions recur
+    heavily across queries, so repeat escapes are a dict hit.
+    """
+    if type(value) is str:
+        return _esc_str(value)
+    return html.escape(str(value), quote=False)
+
+
+def _query_tags(query_tokens: frozenset) -> frozenset:
+    """Collect every matched category tag in a single pass over the tokens."""
+    return frozenset(
+        _KEYWORD_TO_TAG[token] for token in query_tokens if token in _KEYWORD_TO_TAG
+    )
+
+
+class _QueryContext:
+    """Canonicalized view of a user query, computed once per request.
+
+    Lower-casing, tokenization and tag classification used to be re-derived
+    by every consumer; building this once at entry shares the work.
+    """
+
+    __slots__ = ('raw', 'lower', 'tokens', 'tags')
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.lower = raw.lower()
+        self.tokens = frozenset(_QUERY_WORD_RE.findall(self.lower))
+        self.tags = _query_tags(self.tokens)
+
+    @classmethod
+    def of(cls, query) -> '_QueryContext':
+        """Coerce a raw string into a context; pass instances through."""
+        return query if isinstance(query, cls) else cls(query)
+
+# Default food suggestions for when no food recommendations are available;
+# the content is fixed, so the list build and join happen zero times at runtime
+_DEFAULT_FOOD_RECS_HTML = (
+    "<ul><li>Korean BBQ (Samgyeopsal) - Social dining experience</li>"
+    "<li>Street Food in Myeongdong - Best after sunset</li>"
+    "<li>Traditional Korean Tea - Try in Insadong</li></ul>"
+)
+
+# Practical per-neighborhood tips for fallback responses
+_NEIGHBORHOOD_TIPS = {
+    'hongdae': 'Best visited after 9 PM for the full nightlife experience',
+    'myeongdong': 'Great for first-time visitors, but avoid peak tourist hours',
+    'itaewon': 'English is widely spoken here, perfect for international visitors',
+    'gangnam': 'Dress nicely - this is Seoul\'s upscale district',
+    'insadong': 'Perfect for traditional tea ceremonies and cultural shopping',
+    'jongno': 'Visit during weekdays to avoid crowds at palaces'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _neighborhood_insights_block(neighborhood: str, character: str) -> str:
+    """Render the cultural-insights block for a neighborhood.
+
+    Cached: the key space is the handful of known neighborhoods, so after
+    warm-up every fallback reuses the already-built string.
+    """
+    if character:
+        return f"<p><em>🏮 {neighborhood.title()} is known for: {character}</em></p>"
+    return ""
+
+
+@functools.lru_cache(maxsize=None)
+def _neighborhood_tips_block(neighborhood: str) -> str:
+    """Render the local-tip block for a neighborhood (cached, small key space)."""
+    tip = _NEIGHBORHOOD_TIPS.get(neighborhood, 'Explore like a local and be respectful of cultural norms')
+    return f"<p><em>💡 Local tip: {tip}</em></p>"
+
+# Static scaffolding of the Gemini prompt, built once at import time so
+# _create_gemini_prompt only pays for filling in the per-call fields
+_PROMPT_TEMPLATE = """
+        You are an authentic Korean local guide assistant with deep cultural knowledge and a friendly, enthusiastic personality.
+        The user asked: "{user_query}"
+
+        Here are relevant recommendations: {recommendations_text}
+
+        Korean Cultural Context to incorporate:
+        {cultural_context_text}
+
+        User Personalization Context:
+        {personalization_text}
+
+        Response Guidelines:
+        1. Start with a Korean greeting: "{greeting}"
+        2. Use Korean-informed language patterns naturally (include Korean words/phrases with translations)
+        3. Provide authentic cultural insights and context for each recommendation
+        4. Include practical cultural tips and etiquette when relevant
+        5. Mention neighborhood characteristics and local insights
+        6. Prioritize authentic experiences over tourist traps
+        7. Keep the tone conversational, friendly, and knowledgeable like a local friend
+        8. Include cultural significance and social aspects when discussing food or activities
+        9. Use local slang or cultural references appropriately: {local_expressions}
+        10. Structure the response with clear sections but maintain conversational flow
+        11. Output valid HTML directly using <div class="local-guide-response">, <p>, <ul>, <li> and <h4> tags - no markdown syntax
+
+        Avoid:
+        - Generic tourist advice
+        - Overly formal language
+        - Recommendations without cultural context
+        - Ignoring user's personalization preferences
+
+        Create a natural, engaging response that feels like advice from a knowledgeable Korean local friend who understands both Korean culture and the user's preferences.
+        """
 
 
 class ResponseGenerator(BaseService):
@@ -19,7 +203,19 @@ class ResponseGenerator(BaseService):
     Uses Gemini API to create authentic local guide responses with Korean-informed language patterns.
     Includes fallback to structured responses when Gemini is unavailable.
     """
-    
+
+    # Every instance attribute is declared here (plus BaseService's slots),
+    # dropping the per-instance __dict__; the format helpers do many self.x
+    # reads per response, so the slot lookup also shaves attribute access
+    __slots__ = (
+        'gemini_service', 'korean_cultural_context', '_ctx_flat',
+        'local_guide_persona', 'fallback_templates', '_response_cache',
+        '_status_cache', '_status_cache_ts', '_markdown', '_slang_str',
+        '_dining_etiquette_html', '_food_context_html',
+        '_cultural_significance_html', '_practical_advice_html',
+        '_default_cultural_activities_html', '_emergency_fallback_html',
+    )
+
     def __init__(self, api_key: Optional[str] = None):
         super().__init__("ResponseGenerator", api_key)
         
@@ -28,13 +224,98 @@ class ResponseGenerator(BaseService):
         
         # Korean cultural context for authentic responses
         self.korean_cultural_context = self._initialize_korean_cultural_context()
+
+        # Flattened view of the cultural context ('cultural_norms.tipping')
+        # so hot paths do one dict lookup instead of two
+        self._ctx_flat = self._flatten_context(self.korean_cultural_context)
+
+        # Local slang never varies per request either; render it to its
+        # prompt form once instead of stringifying the dict per call
+        self._slang_str = ", ".join(
+            f"{k} ({v})" for k, v in self.korean_cultural_context['local_slang'].items()
+        )
+
+        # Dining etiquette never varies per request, so the block is built once
+        self._dining_etiquette_html = "<ul>" + "".join(
+            f"<li>{tip}</li>" for tip in (
+                self._ctx_flat['food_culture.banchan'],
+                self._ctx_flat['cultural_norms.restaurant_culture'],
+                self._ctx_flat['cultural_norms.tipping']
+            )
+        ) + "</ul>"
+
+        # The other fixed fallback blocks are equally static; building them
+        # here turns their _format_* methods into attribute lookups
+        self._food_context_html = (
+            f"<p><em>🍜 Food culture insight: {self._ctx_flat['food_culture.samgyeopsal']}</em></p>"
+        )
+        self._cultural_significance_html = (
+            "<p><em>🏛️ These experiences connect you with Korea's rich cultural heritage "
+            "and help you understand the values and traditions that shape modern Korean society.</em></p>"
+        )
+        self._practical_advice_html = (
+            "<ul><li>Dress modestly when visiting temples and palaces</li>"
+            "<li>Learn basic Korean greetings - locals appreciate the effort</li>"
+            "<li>Be respectful during cultural ceremonies and performances</li></ul>"
+        )
+        self._default_cultural_activities_html = (
+            "<ul><li>Visit Gyeongbokgung Palace - Traditional Korean architecture</li>"
+            "<li>Try Hanbok rental in Bukchon - Traditional Korean clothing experience</li>"
+            "<li>Temple stay at Jogyesa - Buddhist cultural immersion</li></ul>"
+        )
+
+        # Emergency fallback ignores the query entirely, so every error path
+        # can return this one prebuilt response
+        self._emergency_fallback_html = f"""
+        <div class="local-guide-response">
+            <p>안녕하세요! (Hello!) I'm your Korean local guide, and while I'm having some technical difficulties,
+            I still want to help you explore authentic Korean culture!</p>
+
+            <p>For your question about Korean experiences, here are some timeless recommendations:</p>
+
+            <ul>
+                <li><strong>Gyeongbokgung Palace</strong> - Experience traditional Korean royal architecture</li>
+                <li><strong>Hongdae District</strong> - Youth culture, street food, and nightlife</li>
+                <li><strong>Insadong</strong> - Traditional arts, crafts, and tea culture</li>
+                <li><strong>Korean BBQ Experience</strong> - Social dining with samgyeopsal</li>
+            </ul>
+
+            <p><em>💡 Cultural tip: {self._ctx_flat['cultural_norms.tipping']}</em></p>
+
+            <p>Please try your question again in a moment for more personalized recommendations!</p>
+        </div>
+        """
         
         # Local guide persona characteristics
         self.local_guide_persona = self._initialize_local_guide_persona()
         
         # Response templates for fallback scenarios
         self.fallback_templates = self._initialize_fallback_templates()
+
+        # LRU cache of generated responses keyed by canonicalized query,
+        # recommendation names and user context
+        self._response_cache = OrderedDict()
+
+        # Short-TTL snapshot of the status payload served to health polling
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+
+        # Compiled Markdown converter, reused across responses so extension
+        # registration and regex compilation happen once instead of per call
+        self._markdown = md.Markdown(extensions=['extra', 'sane_lists', 'smarty'])
     
+    @staticmethod
+    def _flatten_context(context: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Flatten a nested context dict into compound dotted keys."""
+        flat = {}
+        for key, value in context.items():
+            compound = f'{prefix}{key}'
+            if isinstance(value, dict):
+                flat.update(ResponseGenerator._flatten_context(value, f'{compound}.'))
+            else:
+                flat[compound] = value
+        return flat
+
     def _initialize_korean_cultural_context(self) -> Dict[str, Any]:
         """Initialize Korean cultural context for authentic responses."""
         return {
@@ -143,78 +424,258 @@ class ResponseGenerator(BaseService):
             Natural, conversational response with Korean cultural insights
         """
         try:
+            # Canonicalize the query once; cache key, classification and
+            # formatting all reuse the same lowered/tokenized view
+            qctx = _QueryContext.of(user_query)
+
+            # Near-duplicate queries over the same recommendations skip the
+            # Gemini round-trip entirely
+            cache_key = self._response_cache_key(qctx, recommendations, user_context)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached
+
             # Use Gemini service if available
             if self.gemini_service and self.gemini_service.is_available():
-                return self._generate_gemini_response(
-                    user_query, recommendations, cultural_context, user_context
-                )
+                try:
+                    response = self._generate_gemini_response(
+                        qctx, recommendations, cultural_context, user_context
+                    )
+                    # Only Gemini-origin responses are cached; fallback HTML
+                    # must not outlive the outage that produced it
+                    self._cache_response(cache_key, response)
+                except Exception as e:
+                    # Breaker open or retries exhausted - serve the
+                    # structured fallback rather than the emergency one
+                    self.logger.warning(f"Gemini generation failed, using structured fallback: {e}")
+                    response = self._generate_fallback_response(
+                        qctx, recommendations, cultural_context, user_context
+                    )
             else:
-                return self._generate_fallback_response(
-                    user_query, recommendations, cultural_context, user_context
+                response = self._generate_fallback_response(
+                    qctx, recommendations, cultural_context, user_context
                 )
-                
+
+            return response
+
         except Exception as e:
             self.logger.error(f"Error generating response for '{user_query}': {e}")
             return self._generate_emergency_fallback(user_query)
+
+    def _cache_response(self, cache_key: tuple, response: str):
+        """Store a generated response, evicting the least recently used entry."""
+        self._response_cache[cache_key] = response
+        if len(self._response_cache) > _RESPONSE_CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+
+    def _response_cache_key(self, user_query: str, recommendations: List[Dict[str, Any]],
+                            user_context: Optional[Dict[str, Any]]) -> tuple:
+        """Build a cache key that is stable across near-duplicate query phrasings."""
+        tokens = _QueryContext.of(user_query).tokens - _QUERY_STOPWORDS
+        rec_names = tuple(
+            str(rec.get('Name') or rec.get('name') or '') for rec in recommendations[:8]
+            if isinstance(rec, dict)
+        )
+        context_key = json.dumps(user_context or {}, sort_keys=True, default=str)
+        return (tokens, rec_names, context_key)
     
-    @retry_with_backoff(max_retries=3, base_delay=1.0)
-    def _generate_gemini_response(self, user_query: str, recommendations: List[Dict[str, Any]], 
+    async def agenerate_response(self, user_query: str, recommendations: List[Dict[str, Any]],
                                  cultural_context: Optional[str] = None,
                                  user_context: Optional[Dict[str, Any]] = None) -> str:
-        """Generate response using Gemini API with Korean cultural context."""
-        
+        """
+        Async counterpart of generate_response.
+
+        Awaiting the Gemini call lets concurrent user queries overlap their
+        network round-trips instead of serializing on one blocking request.
+        """
+        try:
+            # Same cache as the sync path, with the same Gemini-only rule
+            qctx = _QueryContext.of(user_query)
+            cache_key = self._response_cache_key(qctx, recommendations, user_context)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached
+
+            if self.gemini_service and self.gemini_service.is_available():
+                response = await self._agenerate_gemini_response(
+                    qctx, recommendations, cultural_context, user_context
+                )
+                self._cache_response(cache_key, response)
+                return response
+            return self._generate_fallback_response(
+                qctx, recommendations, cultural_context, user_context
+            )
+        except Exception as e:
+            self.logger.error(f"Error generating async response for '{user_query}': {e}")
+            return self._generate_emergency_fallback(user_query)
+
+    async def _agenerate_gemini_response(self, user_query: str, recommendations: List[Dict[str, Any]],
+                                         cultural_context: Optional[str] = None,
+                                         user_context: Optional[Dict[str, Any]] = None) -> str:
+        """Generate a response through the async Gemini client."""
+        qctx = _QueryContext.of(user_query)
+        cultural_elements = self._prepare_cultural_context(qctx, cultural_context)
+        personalization_context = self._prepare_personalization_context(user_context)
+        prompt = self._create_gemini_prompt(
+            qctx.raw, recommendations, cultural_elements, personalization_context
+        )
+
+        response = await self.gemini_service._agenerate_content(prompt)
+        return self._format_response(response)
+
+    def generate_responses_batch(self, requests: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate responses for several independent queries in one call.
+
+        Each request dict takes the same keys as generate_response arguments
+        (user_query, recommendations, cultural_context, user_context). The
+        prompts are dispatched concurrently through the async Gemini client,
+        amortizing the per-request latency floor across the batch instead of
+        paying it once per query.
+        """
+        if not requests:
+            return []
+
+        async def _run_batch() -> List[str]:
+            return await asyncio.gather(*[
+                self.agenerate_response(
+                    request.get('user_query', ''),
+                    request.get('recommendations', []),
+                    request.get('cultural_context'),
+                    request.get('user_context')
+                )
+                for request in requests
+            ])
+
+        try:
+            return asyncio.run(_run_batch())
+        except Exception as e:
+            self.logger.error(f"Batch response generation failed: {e}")
+            return [
+                self.generate_response(
+                    request.get('user_query', ''),
+                    request.get('recommendations', []),
+                    request.get('cultural_context'),
+                    request.get('user_context')
+                )
+                for request in requests
+            ]
+
+    def stream_response(self, user_query: str, recommendations: List[Dict[str, Any]],
+                        cultural_context: Optional[str] = None,
+                        user_context: Optional[Dict[str, Any]] = None):
+        """
+        Stream the response as HTML fragments instead of one final string.
+
+        Markdown blocks are converted and yielded as soon as Gemini completes
+        them, so callers can flush HTML to the user while the rest of the
+        completion is still generating. When Gemini is unavailable the whole
+        fallback response is yielded in one piece.
+        """
+        try:
+            if not (self.gemini_service and self.gemini_service.is_available()):
+                yield self._generate_fallback_response(
+                    user_query, recommendations, cultural_context, user_context
+                )
+                return
+
+            qctx = _QueryContext.of(user_query)
+            cultural_elements = self._prepare_cultural_context(qctx, cultural_context)
+            personalization_context = self._prepare_personalization_context(user_context)
+            prompt = self._create_gemini_prompt(
+                qctx.raw, recommendations, cultural_elements, personalization_context
+            )
+
+            yield '<div class="local-guide-response">'
+            buffer = ''
+            for chunk in self.gemini_service._generate_content_stream(prompt):
+                buffer += chunk
+                # Convert and flush every completed markdown block; the tail
+                # stays buffered until its block boundary arrives
+                while '\n\n' in buffer:
+                    block, buffer = buffer.split('\n\n', 1)
+                    if block.strip():
+                        yield self._markdown.reset().convert(block)
+            if buffer.strip():
+                yield self._markdown.reset().convert(buffer)
+            yield '</div>'
+
+        except Exception as e:
+            self.logger.error(f"Error streaming response for '{user_query}': {e}")
+            yield self._generate_emergency_fallback(user_query)
+
+    def _generate_gemini_response(self, user_query: str, recommendations: List[Dict[str, Any]],
+                                 cultural_context: Optional[str] = None,
+                                 user_context: Optional[Dict[str, Any]] = None) -> str:
+        """Generate response using Gemini API with Korean cultural context.
+
+        Retries live on GeminiService._generate_content, so transient errors
+        re-enter only the network call - the prompt is not rebuilt per retry.
+        """
+        qctx = _QueryContext.of(user_query)
+
         # Prepare cultural context for the prompt
-        cultural_elements = self._prepare_cultural_context(user_query, cultural_context)
-        
+        cultural_elements = self._prepare_cultural_context(qctx, cultural_context)
+
         # Prepare user personalization context
         personalization_context = self._prepare_personalization_context(user_context)
-        
+
         # Create comprehensive prompt for Gemini
         prompt = self._create_gemini_prompt(
-            user_query, recommendations, cultural_elements, personalization_context
+            qctx.raw, recommendations, cultural_elements, personalization_context
         )
         
-        # Generate response using Gemini service
-        response = self.gemini_service._generate_content(prompt)
-        
+        # Generate through the Gemini circuit breaker so a burst of failures
+        # opens it and subsequent requests short-circuit to the fallback
+        # instead of paying the full retry-and-backoff sequence
+        response = self.gemini_service.circuit_breaker.call(
+            self.gemini_service._generate_content, prompt
+        )
+
         # Convert markdown to HTML and return
         return self._format_response(response)
     
     def _prepare_cultural_context(self, user_query: str, additional_context: Optional[str] = None) -> Dict[str, Any]:
         """Prepare relevant Korean cultural context based on user query."""
-        query_lower = user_query.lower()
+        qctx = _QueryContext.of(user_query)
+        query_lower = qctx.lower
+        query_tokens = qctx.tokens
+        tags = qctx.tags
         relevant_context = {}
-        
+
         # Add greeting
-        relevant_context['greeting'] = self.korean_cultural_context['greetings']['local_guide']
-        
+        relevant_context['greeting'] = self._ctx_flat['greetings.local_guide']
+
         # Add relevant cultural norms
-        if any(word in query_lower for word in ['tip', 'money', 'pay']):
-            relevant_context['tipping'] = self.korean_cultural_context['cultural_norms']['tipping']
-        
-        if any(word in query_lower for word in ['time', 'when', 'schedule']):
-            relevant_context['punctuality'] = self.korean_cultural_context['cultural_norms']['punctuality']
-            relevant_context['closing_hours'] = self.korean_cultural_context['cultural_norms']['closing_hours']
-        
-        if any(word in query_lower for word in ['transport', 'taxi', 'subway', 'bus']):
-            relevant_context['transport'] = self.korean_cultural_context['cultural_norms']['transport']
-            relevant_context['subway_etiquette'] = self.korean_cultural_context['cultural_norms']['subway_etiquette']
-        
+        if 'tipping' in tags:
+            relevant_context['tipping'] = self._ctx_flat['cultural_norms.tipping']
+
+        if 'timing' in tags:
+            relevant_context['punctuality'] = self._ctx_flat['cultural_norms.punctuality']
+            relevant_context['closing_hours'] = self._ctx_flat['cultural_norms.closing_hours']
+
+        if 'transport' in tags:
+            relevant_context['transport'] = self._ctx_flat['cultural_norms.transport']
+            relevant_context['subway_etiquette'] = self._ctx_flat['cultural_norms.subway_etiquette']
+
         # Add relevant food culture
-        if any(word in query_lower for word in ['food', 'eat', 'restaurant', 'dining']):
-            relevant_context['banchan'] = self.korean_cultural_context['food_culture']['banchan']
-            relevant_context['restaurant_culture'] = self.korean_cultural_context['cultural_norms']['restaurant_culture']
-            
+        if 'food' in tags:
+            relevant_context['banchan'] = self._ctx_flat['food_culture.banchan']
+            relevant_context['restaurant_culture'] = self._ctx_flat['cultural_norms.restaurant_culture']
+
+            # Multi-word phrase, so this stays a substring check
             if 'street food' in query_lower:
-                relevant_context['street_food_timing'] = self.korean_cultural_context['food_culture']['street_food_timing']
-            
-            if any(word in query_lower for word in ['bbq', 'samgyeopsal', 'pork']):
-                relevant_context['samgyeopsal'] = self.korean_cultural_context['food_culture']['samgyeopsal']
-        
+                relevant_context['street_food_timing'] = self._ctx_flat['food_culture.street_food_timing']
+
+            if 'bbq' in tags:
+                relevant_context['samgyeopsal'] = self._ctx_flat['food_culture.samgyeopsal']
+
         # Add neighborhood context
-        for neighborhood, character in self.korean_cultural_context['neighborhood_characteristics'].items():
-            if neighborhood in query_lower:
-                relevant_context[f'{neighborhood}_character'] = f"{neighborhood.title()}: {character}"
+        for neighborhood in query_tokens & _NEIGHBORHOOD_NAMES:
+            character = self.korean_cultural_context['neighborhood_characteristics'][neighborhood]
+            relevant_context[f'{neighborhood}_character'] = f"{neighborhood.title()}: {character}"
         
         # Add local slang context
         relevant_context['local_expressions'] = self.korean_cultural_context['local_slang']
@@ -253,113 +714,89 @@ class ResponseGenerator(BaseService):
         
         # Format personalization context
         personalization_text = self._format_personalization_for_prompt(personalization_context)
-        
-        prompt = f"""
-        You are an authentic Korean local guide assistant with deep cultural knowledge and a friendly, enthusiastic personality. 
-        The user asked: "{user_query}"
-        
-        Here are relevant recommendations: {recommendations_text}
-        
-        Korean Cultural Context to incorporate:
-        {cultural_context_text}
-        
-        User Personalization Context:
-        {personalization_text}
-        
-        Response Guidelines:
-        1. Start with a Korean greeting: "{cultural_context.get('greeting', '안녕하세요!')}"
-        2. Use Korean-informed language patterns naturally (include Korean words/phrases with translations)
-        3. Provide authentic cultural insights and context for each recommendation
-        4. Include practical cultural tips and etiquette when relevant
-        5. Mention neighborhood characteristics and local insights
-        6. Prioritize authentic experiences over tourist traps
-        7. Keep the tone conversational, friendly, and knowledgeable like a local friend
-        8. Include cultural significance and social aspects when discussing food or activities
-        9. Use local slang or cultural references appropriately: {cultural_context.get('local_expressions', {})}
-        10. Structure the response with clear sections but maintain conversational flow
-        
-        Avoid:
-        - Generic tourist advice
-        - Overly formal language
-        - Recommendations without cultural context
-        - Ignoring user's personalization preferences
-        
-        Create a natural, engaging response that feels like advice from a knowledgeable Korean local friend who understands both Korean culture and the user's preferences.
-        """
-        
-        return prompt
+
+        # The static scaffolding lives in _PROMPT_TEMPLATE (built once at
+        # import), so only the per-call fields are interpolated here
+        return _PROMPT_TEMPLATE.format(
+            user_query=user_query,
+            recommendations_text=recommendations_text,
+            cultural_context_text=cultural_context_text,
+            personalization_text=personalization_text,
+            greeting=cultural_context.get('greeting', '안녕하세요!'),
+            local_expressions=self._slang_str
+        )
     
     def _format_recommendations_for_prompt(self, recommendations: List[Dict[str, Any]]) -> str:
         """Format recommendations for inclusion in Gemini prompt."""
         if not recommendations:
             return "No specific recommendations available - provide general Korean cultural guidance."
-        
-        formatted_recs = []
-        for i, rec in enumerate(recommendations[:8], 1):  # Limit to 8 recommendations
-            name = rec.get('Name', rec.get('name', f'Recommendation {i}'))
-            rec_type = rec.get('Type', rec.get('recommendation_type', 'place'))
-            description = rec.get('wTeaser', rec.get('description', ''))
-            cultural_context = rec.get('cultural_context', '')
-            neighborhood = rec.get('neighborhood', '')
-            
-            rec_text = f"{i}. {name} ({rec_type})"
-            if description:
-                rec_text += f" - {description}"
-            if cultural_context:
-                rec_text += f" | Cultural Context: {cultural_context}"
-            if neighborhood:
-                rec_text += f" | Neighborhood: {neighborhood}"
-            
-            formatted_recs.append(rec_text)
-        
-        return "\n".join(formatted_recs)
-    
+
+        return "\n".join(
+            self._format_recommendation_line(i, rec)
+            for i, rec in enumerate(recommendations[:8], 1)  # Limit to 8 recommendations
+        )
+
+    @staticmethod
+    def _format_recommendation_line(i: int, rec: Dict[str, Any]) -> str:
+        """Format a single recommendation line for the Gemini prompt."""
+        name = rec.get('Name') or rec.get('name') or f'Recommendation {i}'
+        rec_type = rec.get('Type') or rec.get('recommendation_type') or 'place'
+        description = rec.get('wTeaser') or rec.get('description') or ''
+        cultural_context = rec.get('cultural_context', '')
+        neighborhood = rec.get('neighborhood', '')
+
+        parts = [f"{i}. {name} ({rec_type})"]
+        if description:
+            parts.append(f" - {description}")
+        if cultural_context:
+            parts.append(f" | Cultural Context: {cultural_context}")
+        if neighborhood:
+            parts.append(f" | Neighborhood: {neighborhood}")
+        return "".join(parts)
+
     def _format_cultural_context_for_prompt(self, cultural_context: Dict[str, Any]) -> str:
         """Format cultural context for inclusion in Gemini prompt."""
-        context_items = []
-        
-        for key, value in cultural_context.items():
+        def _render(key: str, value: Any) -> str:
             if key == 'local_expressions':
-                expressions = ", ".join([f"{k} ({v})" for k, v in value.items()])
-                context_items.append(f"Local expressions: {expressions}")
-            elif isinstance(value, str):
-                context_items.append(f"{key.replace('_', ' ').title()}: {value}")
-        
-        return "\n".join(context_items) if context_items else "General Korean cultural context"
-    
+                # The slang table is constant, so its rendered form is too
+                return f"Local expressions: {self._slang_str}"
+            return f"{key.replace('_', ' ').title()}: {value}"
+
+        return "\n".join(
+            _render(key, value) for key, value in cultural_context.items()
+            if key == 'local_expressions' or isinstance(value, str)
+        ) or "General Korean cultural context"
+
     def _format_personalization_for_prompt(self, personalization_context: Dict[str, Any]) -> str:
         """Format personalization context for inclusion in Gemini prompt."""
         if not personalization_context:
             return "No specific user preferences available."
-        
-        context_items = []
-        
-        if personalization_context.get('interests'):
-            context_items.append(f"User interests: {', '.join(personalization_context['interests'])}")
-        
-        if personalization_context.get('food_restrictions'):
-            context_items.append(f"Food restrictions: {', '.join(personalization_context['food_restrictions'])}")
-        
-        if personalization_context.get('cultural_preferences'):
-            context_items.append(f"Cultural preferences: {', '.join(personalization_context['cultural_preferences'])}")
-        
-        if personalization_context.get('budget_range'):
-            context_items.append(f"Budget range: {personalization_context['budget_range']}")
-        
-        if personalization_context.get('travel_style'):
-            context_items.append(f"Travel style: {personalization_context['travel_style']}")
-        
-        if personalization_context.get('preferred_neighborhoods'):
-            context_items.append(f"Preferred neighborhoods: {', '.join(personalization_context['preferred_neighborhoods'])}")
-        
-        return "\n".join(context_items) if context_items else "No specific user preferences."
+
+        labeled = (
+            ('User interests', ', '.join(personalization_context.get('interests') or ())),
+            ('Food restrictions', ', '.join(personalization_context.get('food_restrictions') or ())),
+            ('Cultural preferences', ', '.join(personalization_context.get('cultural_preferences') or ())),
+            ('Budget range', personalization_context.get('budget_range') or ''),
+            ('Travel style', personalization_context.get('travel_style') or ''),
+            ('Preferred neighborhoods', ', '.join(personalization_context.get('preferred_neighborhoods') or ()))
+        )
+
+        return "\n".join(
+            f"{label}: {value}" for label, value in labeled if value
+        ) or "No specific user preferences."
     
     def _format_response(self, response: str) -> str:
         """Format response by converting markdown to HTML."""
         try:
-            # Convert markdown to HTML
-            html_response = md.markdown(response, extensions=['extra', 'sane_lists', 'smarty'])
-            
+            # The prompt asks Gemini for HTML directly; when it complies the
+            # markdown pass is skipped entirely. Conversion remains as the
+            # fallback for responses that still come back as markdown.
+            stripped = response.lstrip()
+            if stripped.startswith('<div') or stripped.startswith('<p'):
+                html_response = stripped
+            else:
+                html_response = self._markdown.reset().convert(response)
+
             # Wrap in local guide response div if not already wrapped
             if not html_response.strip().startswith('<div class="local-guide-response">'):
                 html_response = f'<div class="local-guide-response">{html_response}</div>'
@@ -374,58 +811,57 @@ class ResponseGenerator(BaseService):
                                    user_context: Optional[Dict[str, Any]] = None) -> str:
         """Generate structured fallback response when Gemini is unavailable."""
         self.logger.info("Generating fallback response due to Gemini API unavailability")
-        
+        qctx = _QueryContext.of(user_query)
+
         # Determine response type based on query
-        response_type = self._determine_response_type(user_query)
+        response_type = self._determine_response_type(qctx)
         
         # Get appropriate template
         template = self.fallback_templates.get(response_type, self.fallback_templates['general_recommendation'])
         
         # Prepare template variables
         template_vars = self._prepare_fallback_template_vars(
-            user_query, recommendations, cultural_context, user_context, response_type
+            qctx, recommendations, cultural_context, user_context, response_type
         )
         
-        # Format template with variables
+        # Format template with variables; missing placeholders render empty
+        # instead of raising, so a partial vars dict no longer discards the
+        # whole template
         try:
-            formatted_response = template.format(**template_vars)
-            return formatted_response
+            return template.format_map(_TemplateVars(template_vars))
         except Exception as e:
             self.logger.error(f"Error formatting fallback template: {e}")
             return self._generate_emergency_fallback(user_query)
     
     def _determine_response_type(self, user_query: str) -> str:
         """Determine the type of response needed based on user query."""
-        query_lower = user_query.lower()
-        
-        # Check for neighborhood-specific queries
-        neighborhoods = ['hongdae', 'myeongdong', 'itaewon', 'gangnam', 'insadong', 'jongno']
-        if any(neighborhood in query_lower for neighborhood in neighborhoods):
+        tags = _QueryContext.of(user_query).tags
+
+        if 'neighborhood' in tags:
             return 'neighborhood_specific'
-        
-        # Check for food-related queries
-        if any(word in query_lower for word in ['food', 'eat', 'restaurant', 'dining', 'cuisine']):
+        if 'food' in tags:
             return 'food_recommendation'
-        
-        # Check for cultural experience queries
-        if any(word in query_lower for word in ['culture', 'traditional', 'experience', 'activity', 'temple', 'palace']):
+        if 'culture' in tags:
             return 'cultural_experience'
-        
         return 'general_recommendation'
     
     def _prepare_fallback_template_vars(self, user_query: str, recommendations: List[Dict[str, Any]], 
                                        cultural_context: Optional[str], user_context: Optional[Dict[str, Any]],
                                        response_type: str) -> Dict[str, str]:
         """Prepare variables for fallback template formatting."""
-        
+
+        # Partition the recommendations once; every formatter below reads
+        # its bucket instead of re-filtering the full list
+        partition = self._partition_recommendations(recommendations)
+
         # Base variables
         vars_dict = {
-            'greeting': self.korean_cultural_context['greetings']['local_guide'],
-            'recommendations_section': self._format_recommendations_section(recommendations),
+            'greeting': self._ctx_flat['greetings.local_guide'],
+            'recommendations_section': self._format_recommendations_section(recommendations, partition),
             'cultural_context_section': self._format_cultural_context_section(cultural_context),
             'practical_tips_section': self._format_practical_tips_section(user_query)
         }
-        
+
         # Add response-type specific variables
         if response_type == 'neighborhood_specific':
             neighborhood = self._extract_neighborhood_from_query(user_query)
@@ -433,67 +869,96 @@ class ResponseGenerator(BaseService):
                 vars_dict.update({
                     'neighborhood': neighborhood.title(),
                     'neighborhood_character': self.korean_cultural_context['neighborhood_characteristics'].get(neighborhood, 'Unique Korean district'),
-                    'neighborhood_recommendations': self._format_neighborhood_recommendations(recommendations, neighborhood),
+                    'neighborhood_recommendations': self._format_neighborhood_recommendations(recommendations, neighborhood, partition),
                     'cultural_insights': self._format_neighborhood_cultural_insights(neighborhood),
                     'local_tips': self._format_neighborhood_tips(neighborhood)
                 })
-        
+
         elif response_type == 'food_recommendation':
             vars_dict.update({
-                'food_recommendations': self._format_food_recommendations(recommendations),
+                'food_recommendations': self._format_food_recommendations(recommendations, partition),
                 'dining_etiquette': self._format_dining_etiquette(),
                 'cultural_context': self._format_food_cultural_context()
             })
-        
+
         elif response_type == 'cultural_experience':
             vars_dict.update({
-                'cultural_activities': self._format_cultural_activities(recommendations),
+                'cultural_activities': self._format_cultural_activities(recommendations, partition),
                 'cultural_significance': self._format_cultural_significance(),
                 'practical_advice': self._format_cultural_practical_advice()
             })
-        
+
         return vars_dict
+
+    @staticmethod
+    def _partition_recommendations(recommendations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Partition recommendations by kind and neighborhood in one pass."""
+        buckets = {
+            'place': [],
+            'experience': [],
+            'food': [],
+            'by_neighborhood': defaultdict(list)
+        }
+        for r in recommendations:
+            rec_type = str(r.get('recommendation_type') or r.get('Type') or '').lower()
+            category = str(r.get('category', '')).lower()
+            if rec_type == 'place':
+                buckets['place'].append(r)
+            elif rec_type == 'cultural_experience':
+                buckets['experience'].append(r)
+            elif 'restaurant' in rec_type or 'food' in rec_type \
+                    or 'restaurant' in category or 'food' in category:
+                buckets['food'].append(r)
+
+            neighborhood = str(r.get('neighborhood', '')).lower()
+            if neighborhood:
+                buckets['by_neighborhood'][neighborhood].append(r)
+        return buckets
     
-    def _format_recommendations_section(self, recommendations: List[Dict[str, Any]]) -> str:
+    def _format_recommendations_section(self, recommendations: List[Dict[str, Any]],
+                                        partition: Optional[Dict[str, Any]] = None) -> str:
         """Format recommendations section for fallback response."""
         if not recommendations:
             return "<p>Here are some authentic Korean experiences I always recommend:</p>"
-        
-        sections = []
-        
-        # Group recommendations by type
-        places = [r for r in recommendations if r.get('recommendation_type') == 'place' or r.get('Type') == 'place']
-        experiences = [r for r in recommendations if r.get('recommendation_type') == 'cultural_experience']
-        food = [r for r in recommendations if 'restaurant' in str(r.get('Type', '')).lower() or 'food' in str(r.get('category', '')).lower()]
-        
+
+        if partition is None:
+            partition = self._partition_recommendations(recommendations)
+        places = partition['place']
+        experiences = partition['experience']
+        food = partition['food']
+
+        # Stream the fragments into one buffer instead of growing a list of
+        # tiny strings and copying it again in a final join
+        buf = io.StringIO()
+
         if places:
-            sections.append("<h4>🏮 Places to Visit:</h4>")
-            sections.append("<ul>")
+            buf.write("<h4>🏮 Places to Visit:</h4><ul>")
             for place in places[:3]:
-                name = place.get('Name', place.get('name', 'Korean Place'))
-                context = place.get('cultural_context', 'Authentic Korean experience')
-                sections.append(f"<li><strong>{name}</strong> - {context}</li>")
-            sections.append("</ul>")
-        
+                buf.write(
+                    f"<li><strong>{_esc(place.get('Name') or place.get('name') or 'Korean Place')}</strong>"
+                    f" - {_esc(place.get('cultural_context', 'Authentic Korean experience'))}</li>"
+                )
+            buf.write("</ul>")
+
         if food:
-            sections.append("<h4>🍜 Food Experiences:</h4>")
-            sections.append("<ul>")
+            buf.write("<h4>🍜 Food Experiences:</h4><ul>")
             for item in food[:3]:
-                name = item.get('Name', item.get('name', 'Korean Food'))
-                description = item.get('wTeaser', item.get('description', 'Authentic Korean cuisine'))
-                sections.append(f"<li><strong>{name}</strong> - {description}</li>")
-            sections.append("</ul>")
-        
+                buf.write(
+                    f"<li><strong>{_esc(item.get('Name') or item.get('name') or 'Korean Food')}</strong>"
+                    f" - {_esc(item.get('wTeaser') or item.get('description') or 'Authentic Korean cuisine')}</li>"
+                )
+            buf.write("</ul>")
+
         if experiences:
-            sections.append("<h4>🎭 Cultural Experiences:</h4>")
-            sections.append("<ul>")
+            buf.write("<h4>🎭 Cultural Experiences:</h4><ul>")
             for exp in experiences[:3]:
-                name = exp.get('Name', 'Korean Cultural Experience')
-                teaser = exp.get('wTeaser', 'Authentic Korean cultural activity')
-                sections.append(f"<li><strong>{name}</strong> - {teaser}</li>")
-            sections.append("</ul>")
-        
-        return "".join(sections) if sections else "<p>Let me share some authentic Korean experiences with you!</p>"
+                buf.write(
+                    f"<li><strong>{_esc(exp.get('Name', 'Korean Cultural Experience'))}</strong>"
+                    f" - {_esc(exp.get('wTeaser', 'Authentic Korean cultural activity'))}</li>"
+                )
+            buf.write("</ul>")
+
+        return buf.getvalue() or "<p>Let me share some authentic Korean experiences with you!</p>"
     
     def _format_cultural_context_section(self, cultural_context: Optional[str]) -> str:
         """Format cultural context section for fallback response."""
@@ -501,49 +966,59 @@ class ResponseGenerator(BaseService):
             return f"<p><em>💡 Cultural insight: {cultural_context}</em></p>"
         
         # Default cultural tip
-        return f"<p><em>💡 Cultural tip: {self.korean_cultural_context['cultural_norms']['tipping']}</em></p>"
+        return f"<p><em>💡 Cultural tip: {self._ctx_flat['cultural_norms.tipping']}</em></p>"
     
     def _format_practical_tips_section(self, user_query: str) -> str:
         """Format practical tips section based on user query."""
-        query_lower = user_query.lower()
+        qctx = _QueryContext.of(user_query)
+        query_lower = qctx.lower
+        tags = qctx.tags
         tips = []
-        
-        if any(word in query_lower for word in ['time', 'when', 'hours']):
-            tips.append(self.korean_cultural_context['cultural_norms']['closing_hours'])
-        
-        if any(word in query_lower for word in ['transport', 'travel', 'get around']):
-            tips.append(self.korean_cultural_context['cultural_norms']['transport'])
-        
-        if any(word in query_lower for word in ['food', 'restaurant', 'eat']):
-            tips.append(self.korean_cultural_context['food_culture']['banchan'])
-        
+
+        if 'timing' in tags:
+            tips.append(self._ctx_flat['cultural_norms.closing_hours'])
+
+        # 'get around' is a multi-word phrase, so it keeps a substring check
+        if 'transport' in tags or 'get around' in query_lower:
+            tips.append(self._ctx_flat['cultural_norms.transport'])
+
+        if 'food' in tags:
+            tips.append(self._ctx_flat['food_culture.banchan'])
+
         if not tips:
-            tips.append(self.korean_cultural_context['cultural_norms']['punctuality'])
-        
-        tips_html = "<ul>" + "".join([f"<li>{tip}</li>" for tip in tips[:2]]) + "</ul>"
-        return f"<h4>🎯 Practical Tips:</h4>{tips_html}"
+            tips.append(self._ctx_flat['cultural_norms.punctuality'])
+
+        buf = io.StringIO()
+        buf.write("<h4>🎯 Practical Tips:</h4><ul>")
+        for tip in tips[:2]:
+            buf.write(f"<li>{tip}</li>")
+        buf.write("</ul>")
+        return buf.getvalue()
     
     def _extract_neighborhood_from_query(self, user_query: str) -> Optional[str]:
         """Extract neighborhood name from user query."""
-        query_lower = user_query.lower()
-        
+        query_tokens = _QueryContext.of(user_query).tokens
+
         for neighborhood in self.korean_cultural_context['neighborhood_characteristics'].keys():
-            if neighborhood in query_lower:
+            if neighborhood in query_tokens:
                 return neighborhood
-        
+
         return None
     
-    def _format_neighborhood_recommendations(self, recommendations: List[Dict[str, Any]], neighborhood: str) -> str:
+    def _format_neighborhood_recommendations(self, recommendations: List[Dict[str, Any]], neighborhood: str,
+                                             partition: Optional[Dict[str, Any]] = None) -> str:
         """Format neighborhood-specific recommendations."""
-        neighborhood_recs = [r for r in recommendations if str(r.get('neighborhood', '')).lower() == neighborhood]
-        
+        if partition is None:
+            partition = self._partition_recommendations(recommendations)
+        neighborhood_recs = partition['by_neighborhood'].get(neighborhood, [])
+
         if not neighborhood_recs:
             return f"<p>Here are authentic experiences in {neighborhood.title()}:</p>"
         
         items = []
         for rec in neighborhood_recs[:3]:
-            name = rec.get('Name', rec.get('name', 'Local Experience'))
-            context = rec.get('cultural_context', 'Authentic neighborhood experience')
+            name = _esc(rec.get('Name') or rec.get('name') or 'Local Experience')
+            context = _esc(rec.get('cultural_context', 'Authentic neighborhood experience'))
             items.append(f"<li><strong>{name}</strong> - {context}</li>")
         
         return "<ul>" + "".join(items) + "</ul>"
@@ -551,113 +1026,73 @@ class ResponseGenerator(BaseService):
     def _format_neighborhood_cultural_insights(self, neighborhood: str) -> str:
         """Format cultural insights for specific neighborhood."""
         character = self.korean_cultural_context['neighborhood_characteristics'].get(neighborhood, '')
-        if character:
-            return f"<p><em>🏮 {neighborhood.title()} is known for: {character}</em></p>"
-        return ""
-    
+        return _neighborhood_insights_block(neighborhood, character)
+
     def _format_neighborhood_tips(self, neighborhood: str) -> str:
         """Format practical tips for specific neighborhood."""
-        tips = {
-            'hongdae': 'Best visited after 9 PM for the full nightlife experience',
-            'myeongdong': 'Great for first-time visitors, but avoid peak tourist hours',
-            'itaewon': 'English is widely spoken here, perfect for international visitors',
-            'gangnam': 'Dress nicely - this is Seoul\'s upscale district',
-            'insadong': 'Perfect for traditional tea ceremonies and cultural shopping',
-            'jongno': 'Visit during weekdays to avoid crowds at palaces'
-        }
-        
-        tip = tips.get(neighborhood, 'Explore like a local and be respectful of cultural norms')
-        return f"<p><em>💡 Local tip: {tip}</em></p>"
+        return _neighborhood_tips_block(neighborhood)
     
-    def _format_food_recommendations(self, recommendations: List[Dict[str, Any]]) -> str:
+    def _format_food_recommendations(self, recommendations: List[Dict[str, Any]],
+                                     partition: Optional[Dict[str, Any]] = None) -> str:
         """Format food-specific recommendations."""
-        food_recs = [r for r in recommendations if 'food' in str(r.get('Type', '')).lower() or 'restaurant' in str(r.get('category', '')).lower()]
-        
+        if partition is None:
+            partition = self._partition_recommendations(recommendations)
+        food_recs = partition['food']
+
         if not food_recs:
-            default_foods = [
-                "Korean BBQ (Samgyeopsal) - Social dining experience",
-                "Street Food in Myeongdong - Best after sunset",
-                "Traditional Korean Tea - Try in Insadong"
-            ]
-            return "<ul>" + "".join([f"<li>{food}</li>" for food in default_foods]) + "</ul>"
-        
-        items = []
+            return _DEFAULT_FOOD_RECS_HTML
+
+        buf = io.StringIO()
+        buf.write("<ul>")
         for rec in food_recs[:3]:
-            name = rec.get('Name', rec.get('name', 'Korean Food'))
-            description = rec.get('wTeaser', rec.get('description', 'Authentic Korean cuisine'))
-            items.append(f"<li><strong>{name}</strong> - {description}</li>")
-        
-        return "<ul>" + "".join(items) + "</ul>"
+            name = _esc(rec.get('Name') or rec.get('name') or 'Korean Food')
+            description = _esc(rec.get('wTeaser') or rec.get('description') or 'Authentic Korean cuisine')
+            buf.write(f"<li><strong>{name}</strong> - {description}</li>")
+        buf.write("</ul>")
+        return buf.getvalue()
     
     def _format_dining_etiquette(self) -> str:
-        """Format dining etiquette information."""
-        etiquette_tips = [
-            self.korean_cultural_context['food_culture']['banchan'],
-            self.korean_cultural_context['cultural_norms']['restaurant_culture'],
-            self.korean_cultural_context['cultural_norms']['tipping']
-        ]
-        
-        return "<ul>" + "".join([f"<li>{tip}</li>" for tip in etiquette_tips]) + "</ul>"
+        """Format dining etiquette information (built once in __init__)."""
+        return self._dining_etiquette_html
     
     def _format_food_cultural_context(self) -> str:
-        """Format food cultural context."""
-        return f"<p><em>🍜 Food culture insight: {self.korean_cultural_context['food_culture']['samgyeopsal']}</em></p>"
+        """Format food cultural context (built once in __init__)."""
+        return self._food_context_html
     
-    def _format_cultural_activities(self, recommendations: List[Dict[str, Any]]) -> str:
+    def _format_cultural_activities(self, recommendations: List[Dict[str, Any]],
+                                    partition: Optional[Dict[str, Any]] = None) -> str:
         """Format cultural activity recommendations."""
-        cultural_recs = [r for r in recommendations if r.get('recommendation_type') == 'cultural_experience']
-        
+        if partition is None:
+            partition = self._partition_recommendations(recommendations)
+        cultural_recs = partition['experience']
+
         if not cultural_recs:
-            default_activities = [
-                "Visit Gyeongbokgung Palace - Traditional Korean architecture",
-                "Try Hanbok rental in Bukchon - Traditional Korean clothing experience",
-                "Temple stay at Jogyesa - Buddhist cultural immersion"
-            ]
-            return "<ul>" + "".join([f"<li>{activity}</li>" for activity in default_activities]) + "</ul>"
-        
-        items = []
-        for rec in cultural_recs[:3]:
-            name = rec.get('Name', 'Cultural Experience')
-            description = rec.get('wTeaser', rec.get('description', 'Authentic Korean cultural activity'))
-            items.append(f"<li><strong>{name}</strong> - {description}</li>")
-        
-        return "<ul>" + "".join(items) + "</ul>"
+            return self._default_cultural_activities_html
+        
+        # Feed the generator straight into join; at a cap of three items the
+        # intermediate list and its append calls are pure overhead
+        items = "".join(
+            f"<li><strong>{_esc(rec.get('Name', 'Cultural Experience'))}</strong>"
+            f" - {_esc(rec.get('wTeaser') or rec.get('description') or 'Authentic Korean cultural activity')}</li>"
+            for rec in cultural_recs[:3]
+        )
+        return f"<ul>{items}</ul>"
     
     def _format_cultural_significance(self) -> str:
-        """Format cultural significance information."""
-        return "<p><em>🏛️ These experiences connect you with Korea's rich cultural heritage and help you understand the values and traditions that shape modern Korean society.</em></p>"
+        """Format cultural significance information (built once in __init__)."""
+        return self._cultural_significance_html
     
     def _format_cultural_practical_advice(self) -> str:
-        """Format practical advice for cultural experiences."""
-        advice = [
-            "Dress modestly when visiting temples and palaces",
-            "Learn basic Korean greetings - locals appreciate the effort",
-            "Be respectful during cultural ceremonies and performances"
-        ]
-        
-        return "<ul>" + "".join([f"<li>{tip}</li>" for tip in advice]) + "</ul>"
+        """Format practical advice for cultural experiences (built once in __init__)."""
+        return self._practical_advice_html
     
     def _generate_emergency_fallback(self, user_query: str) -> str:
-        """Generate emergency fallback response when all else fails."""
-        return f"""
-        <div class="local-guide-response">
-            <p>안녕하세요! (Hello!) I'm your Korean local guide, and while I'm having some technical difficulties, 
-            I still want to help you explore authentic Korean culture!</p>
-            
-            <p>For your question about Korean experiences, here are some timeless recommendations:</p>
-            
-            <ul>
-                <li><strong>Gyeongbokgung Palace</strong> - Experience traditional Korean royal architecture</li>
-                <li><strong>Hongdae District</strong> - Youth culture, street food, and nightlife</li>
-                <li><strong>Insadong</strong> - Traditional arts, crafts, and tea culture</li>
-                <li><strong>Korean BBQ Experience</strong> - Social dining with samgyeopsal</li>
-            </ul>
-            
-            <p><em>💡 Cultural tip: {self.korean_cultural_context['cultural_norms']['tipping']}</em></p>
-            
-            <p>Please try your question again in a moment for more personalized recommendations!</p>
-        </div>
+        """Generate emergency fallback response when all else fails.
+
+        The response does not depend on the query, so it is built once in
+        __init__; the parameter is kept for caller compatibility.
         """
+        return self._emergency_fallback_html
     
     def format_local_guide_response(self, data: Dict[str, Any]) -> str:
         """
@@ -669,17 +1104,21 @@ class ResponseGenerator(BaseService):
         Returns:
             Formatted HTML response with Korean cultural context
         """
+        # Validate the payload up front instead of wrapping the whole body in
+        # a broad exception handler; the dict reads cannot fail after this
+        if not isinstance(data, dict):
+            return self._generate_emergency_fallback('')
+
+        user_query = data.get('user_query', '')
+        recommendations = data.get('recommendations', [])
+        cultural_context = data.get('cultural_context', '')
+        user_context = data.get('user_context', {})
+
         try:
-            user_query = data.get('user_query', '')
-            recommendations = data.get('recommendations', [])
-            cultural_context = data.get('cultural_context', '')
-            user_context = data.get('user_context', {})
-            
             return self.generate_response(user_query, recommendations, cultural_context, user_context)
-            
-        except Exception as e:
+        except (KeyError, TypeError, ValueError) as e:
             self.logger.error(f"Error formatting local guide response: {e}")
-            return self._generate_emergency_fallback(data.get('user_query', 'Korean culture'))
+            return self._generate_emergency_fallback(user_query or 'Korean culture')
     
     def _handle_fallback(self, error: Exception) -> str:
         """Handle fallback when ResponseGenerator is unavailable."""
@@ -687,9 +1126,13 @@ class ResponseGenerator(BaseService):
         return self._generate_emergency_fallback("general inquiry")
     
     def get_status(self) -> Dict[str, Any]:
-        """Get current ResponseGenerator status."""
+        """Get current ResponseGenerator status (cached for a short TTL)."""
+        if (self._status_cache is not None and
+                time.monotonic() - self._status_cache_ts < _STATUS_CACHE_TTL):
+            return self._status_cache
+
         base_status = super().get_status()
-        
+
         # Add Gemini service status
         gemini_status = self.gemini_service.get_status() if self.gemini_service else {
             'service': 'GeminiService',
@@ -703,7 +1146,9 @@ class ResponseGenerator(BaseService):
             'local_guide_persona_loaded': bool(self.local_guide_persona),
             'fallback_templates_loaded': bool(self.fallback_templates)
         })
-        
+
+        self._status_cache = base_status
+        self._status_cache_ts = time.monotonic()
         return base_status
 
 
@@ -3,6 +3,10 @@ Service Manager for coordinating all API integrations.
 Provides centralized service management with health monitoring and fallback coordination.
 """
 import os
+import time
+import logging
+import concurrent.futures
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional
 from .base_service import BaseService
 from .tastedive_api import CulturalDiscoveryEngine
@@ -12,82 +16,198 @@ from .gemini_api import GeminiService
 from .response_generator import ResponseGenerator
 from .local_guide_system import LocalGuideSystem
 
+logger = logging.getLogger(__name__)
+
+# How long (seconds) an aggregated status snapshot stays fresh; polling
+# dashboards hitting the health endpoint in bursts reuse the cached dict
+# instead of re-probing every service
+STATUS_CACHE_TTL = float(os.getenv('SERVICE_STATUS_CACHE_TTL', '1.0'))
+
+# Shared pool for overlapping independent backend calls within one request
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix='service-manager'
+)
+
+# Head start (seconds) the primary search gets before the Google Maps
+# fallback is hedged alongside it, sized against the sub-200ms search budget
+SEARCH_HEDGE_DELAY = float(os.getenv('SEARCH_HEDGE_DELAY', '0.15'))
+
+# Maximum number of recommendation lists kept in the LRU cache, and how long
+# (seconds) an entry stays fresh before the backends are consulted again
+_REC_CACHE_MAX_ENTRIES = 256
+_REC_CACHE_TTL = 3600.0
+
+# Maximum age (seconds) of the response pipeline before it is rebuilt; kept
+# at the circuit breaker's recovery_timeout so a service excluded while its
+# breaker was open gets re-admitted (and probed) once recovery is due
+_PIPELINE_MAX_AGE = 60.0
+
+# Fixed fallback data, built once at import time; under a service outage the
+# fallback paths run per request, so re-creating these literals each call
+# would be pure allocation overhead
+_FALLBACK_CULTURAL_RECS = (
+    {
+        'Name': 'Korean Traditional Music',
+        'Type': 'music',
+        'wTeaser': 'Experience traditional Korean instruments and melodies'
+    },
+    {
+        'Name': 'Korean Temple Stay',
+        'Type': 'experience',
+        'wTeaser': 'Immerse yourself in Korean Buddhist culture'
+    },
+    {
+        'Name': 'Korean Cooking Class',
+        'Type': 'activity',
+        'wTeaser': 'Learn to prepare authentic Korean dishes'
+    },
+)
+
+# Interest keyword -> matching fallback subset, precomputed so per-call
+# filtering reduces to a set lookup
+_FALLBACK_MUSIC_RECS = [r for r in _FALLBACK_CULTURAL_RECS if r['Type'] == 'music']
+_FALLBACK_FOOD_RECS = [r for r in _FALLBACK_CULTURAL_RECS if 'cooking' in r['Name'].lower()]
+_FALLBACK_INDEX = {
+    'music': _FALLBACK_MUSIC_RECS,
+    'k-pop': _FALLBACK_MUSIC_RECS,
+    'food': _FALLBACK_FOOD_RECS,
+    'cooking': _FALLBACK_FOOD_RECS,
+}
+
+_FALLBACK_PLACES = (
+    {
+        'name': 'Gyeongbokgung Palace',
+        'category': 'attraction',
+        'location': {'lat': 37.5796, 'lng': 126.9770},
+        'cultural_context': 'Historic royal palace showcasing Korean architecture',
+        'neighborhood': 'jongno'
+    },
+    {
+        'name': 'Bukchon Hanok Village',
+        'category': 'attraction',
+        'location': {'lat': 37.5834, 'lng': 126.9834},
+        'cultural_context': 'Traditional Korean houses and cultural heritage',
+        'neighborhood': 'jongno'
+    },
+    {
+        'name': 'Insadong Cultural Street',
+        'category': 'attraction',
+        'location': {'lat': 37.5759, 'lng': 126.9852},
+        'cultural_context': 'Traditional arts, crafts, and tea culture',
+        'neighborhood': 'jongno'
+    },
+)
+
+_FALLBACK_RESPONSE_NO_RECS_HTML = """
+            <div class="fallback-response">
+                <p>Thank you for your interest in Korean culture!</p>
+                <p>While our recommendation system is temporarily unavailable, I'd suggest exploring:</p>
+                <ul>
+                    <li><strong>Hongdae</strong> - Youth culture and nightlife</li>
+                    <li><strong>Myeongdong</strong> - Shopping and street food</li>
+                    <li><strong>Itaewon</strong> - International district</li>
+                    <li><strong>Gangnam</strong> - Modern Korean lifestyle</li>
+                </ul>
+                <p><em>Please try your question again in a moment for personalized recommendations.</em></p>
+            </div>
+            """
+
 
 class ServiceManager:
     """Centralized manager for all API services with health monitoring."""
-    
+
+    __slots__ = (
+        'services', '_status_cache', '_status_cache_ts', '_healthy_cache',
+        '_healthy_cache_ts', '_rec_cache', '_response_pipeline',
+        '_pipeline_ts', '_local_guide_system', '_local_guide_initialized',
+    )
+
+    # Service name -> constructor; instances are created on first access so
+    # entry points that touch one service do not pay for the others
+    _FACTORIES = {
+        'cultural_discovery': CulturalDiscoveryEngine,
+        'search': SearchService,
+        'googlemaps': GoogleMapsService,
+        'gemini': GeminiService,
+        'response_generator': ResponseGenerator,
+    }
+
+    # Backward-compatibility names resolving to the same instances
+    _ALIASES = {
+        'tastedive': 'cultural_discovery',
+        'algolia': 'search',
+    }
+
     def __init__(self):
-        """Initialize all services with environment configuration."""
+        """Initialize the manager; services are constructed lazily."""
         self.services = {}
-        self._initialize_services()
-        
-        # Initialize Local Guide System as the main orchestrator
-        self.local_guide_system = None
-        self._initialize_local_guide_system()
-    
-    def _initialize_services(self):
-        """Initialize all API services with error handling."""
-        try:
-            self.services['cultural_discovery'] = CulturalDiscoveryEngine()
-        except Exception as e:
-            print(f"Warning: Cultural Discovery Engine initialization failed: {e}")
-            self.services['cultural_discovery'] = None
-        
-        # Keep TasteDive for backward compatibility
-        try:
-            self.services['tastedive'] = CulturalDiscoveryEngine()
-        except Exception as e:
-            print(f"Warning: TasteDive service initialization failed: {e}")
-            self.services['tastedive'] = None
-        
-        try:
-            self.services['search'] = SearchService()
-        except Exception as e:
-            print(f"Warning: Search service initialization failed: {e}")
-            self.services['search'] = None
-        
-        # Keep Algolia for backward compatibility
-        try:
-            self.services['algolia'] = SearchService()
-        except Exception as e:
-            print(f"Warning: Algolia service initialization failed: {e}")
-            self.services['algolia'] = None
-        
-        try:
-            self.services['googlemaps'] = GoogleMapsService()
-        except Exception as e:
-            print(f"Warning: Google Maps service initialization failed: {e}")
-            self.services['googlemaps'] = None
-        
-        try:
-            self.services['gemini'] = GeminiService()
-        except Exception as e:
-            print(f"Warning: Gemini service initialization failed: {e}")
-            self.services['gemini'] = None
-        
-        try:
-            self.services['response_generator'] = ResponseGenerator()
-        except Exception as e:
-            print(f"Warning: Response Generator initialization failed: {e}")
-            self.services['response_generator'] = None
-    
+
+        # Short-TTL snapshot of the aggregated status payload
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+
+        # Short-TTL snapshot of the healthy-service list
+        self._healthy_cache = None
+        self._healthy_cache_ts = 0.0
+
+        # LRU cache of recommendation lists keyed by normalized query and
+        # sorted interests, so repeated popular queries skip the backends
+        self._rec_cache = OrderedDict()
+
+        # Ordered response generators filtered by health, built on first use
+        # and rebuilt when a service's health state flips or the build ages
+        # past the breaker recovery window
+        self._response_pipeline = None
+        self._pipeline_ts = 0.0
+
+        # The Local Guide System orchestrator is also created on first use
+        self._local_guide_system = None
+        self._local_guide_initialized = False
+
+    @property
+    def local_guide_system(self):
+        """Lazily-constructed Local Guide System orchestrator."""
+        if not self._local_guide_initialized:
+            self._initialize_local_guide_system()
+        return self._local_guide_system
+
     def _initialize_local_guide_system(self):
         """Initialize the Local Guide System orchestrator."""
+        self._local_guide_initialized = True
         try:
-            self.local_guide_system = LocalGuideSystem()
-            print("Local Guide System initialized successfully")
+            self._local_guide_system = LocalGuideSystem()
+            logger.info("Local Guide System initialized successfully")
         except Exception as e:
-            print(f"Warning: Local Guide System initialization failed: {e}")
-            self.local_guide_system = None
-    
+            logger.warning("Local Guide System initialization failed: %s", e)
+            self._local_guide_system = None
+
     def get_service(self, service_name: str) -> Optional[BaseService]:
-        """Get a specific service by name."""
-        return self.services.get(service_name)
-    
+        """Get a specific service by name, constructing it on first access."""
+        service_name = self._ALIASES.get(service_name, service_name)
+        if service_name in self.services:
+            return self.services[service_name]
+
+        factory = self._FACTORIES.get(service_name)
+        if factory is None:
+            return None
+
+        try:
+            service = factory()
+        except Exception as e:
+            logger.warning("%s service initialization failed: %s", service_name, e)
+            service = None
+        self.services[service_name] = service
+        return service
+
     def get_service_status(self) -> Dict[str, Dict[str, Any]]:
-        """Get status of all services."""
+        """Get status of all services (cached for STATUS_CACHE_TTL seconds)."""
+        if (self._status_cache is not None and
+                time.monotonic() - self._status_cache_ts < STATUS_CACHE_TTL):
+            return self._status_cache
+
         status = {}
-        for name, service in self.services.items():
+        for name in (*self._FACTORIES, *self._ALIASES):
+            service = self.get_service(name)
             if service:
                 status[name] = service.get_status()
             else:
@@ -97,7 +217,7 @@ class ServiceManager:
                     "failure_count": 0,
                     "available": False
                 }
-        
+
         # Add Local Guide System status
         if self.local_guide_system:
             status['local_guide_system'] = self.local_guide_system.get_status()
@@ -108,9 +228,11 @@ class ServiceManager:
                 "failure_count": 0,
                 "available": False
             }
-        
+
+        self._status_cache = status
+        self._status_cache_ts = time.monotonic()
         return status
-    
+
     def get_local_guide_recommendation(self, user_query: str, user_profile: Optional[Dict[str, Any]] = None,
                                      location: Optional[tuple] = None) -> Dict[str, Any]:
         """
@@ -128,18 +250,64 @@ class ServiceManager:
             try:
                 return self.local_guide_system.get_recommendation(user_query, user_profile, location)
             except Exception as e:
-                print(f"Local Guide System failed: {e}")
+                logger.warning("Local Guide System failed: %s", e)
         
         # Fallback to legacy recommendation system
         return self._get_legacy_recommendations(user_query, user_profile)
     
     def get_healthy_services(self) -> List[str]:
-        """Get list of currently healthy services."""
+        """Get list of currently healthy services (cached for a short TTL)."""
+        if (self._healthy_cache is not None and
+                time.monotonic() - self._healthy_cache_ts < 0.5):
+            return list(self._healthy_cache)
+
         healthy = []
-        for name, service in self.services.items():
+        for name in (*self._FACTORIES, *self._ALIASES):
+            service = self.get_service(name)
             if service and service.is_available():
                 healthy.append(name)
-        return healthy
+
+        self._healthy_cache = healthy
+        self._healthy_cache_ts = time.monotonic()
+        return list(healthy)
+
+    def mark_unhealthy(self, service_name: str) -> None:
+        """Invalidate cached health state after a service call fails.
+
+        Error paths call this so the next health read reflects the failure
+        immediately instead of serving a stale-healthy snapshot.
+        """
+        self._healthy_cache = None
+        self._status_cache = None
+        self._response_pipeline = None
+
+    @staticmethod
+    def _ready_for_calls(service) -> bool:
+        """Whether a service should be in the pipeline.
+
+        Includes open-breaker services whose recovery timeout has elapsed:
+        the breaker only half-opens when the service is actually called, so
+        excluding them here would starve the breaker of the probe that could
+        close it again.
+        """
+        return service.is_available() or service.circuit_breaker._should_attempt_reset()
+
+    def refresh_pipeline(self) -> None:
+        """Rebuild the ordered response-generation pipeline from current health.
+
+        Filtering by availability happens here, on health transitions, so the
+        per-request path iterates an already-vetted list instead of probing
+        every generator again.
+        """
+        pipeline = []
+        response_generator = self.get_service('response_generator')
+        if response_generator and self._ready_for_calls(response_generator):
+            pipeline.append(('Response Generator', response_generator.generate_response))
+        gemini = self.get_service('gemini')
+        if gemini and self._ready_for_calls(gemini):
+            pipeline.append(('Gemini', gemini.generate_local_guide_response))
+        self._response_pipeline = pipeline
+        self._pipeline_ts = time.monotonic()
     
     def _get_legacy_recommendations(self, user_query: str, user_profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Fallback to legacy recommendation system when Local Guide System fails."""
@@ -165,7 +333,7 @@ class ServiceManager:
                 'legacy_system': True
             }
         except Exception as e:
-            print(f"Legacy recommendation system also failed: {e}")
+            logger.error("Legacy recommendation system also failed: %s", e)
             return {
                 'response': "<p>I apologize, but I'm having trouble generating recommendations right now. Please try again later.</p>",
                 'recommendations': [],
@@ -182,48 +350,68 @@ class ServiceManager:
         Get cultural recommendations using the Cultural Discovery Engine.
         Falls back gracefully when services are unavailable.
         """
+        # Popular queries repeat across users; serve them from the LRU cache
+        # instead of re-hitting the backends
+        cache_key = (query.strip().lower(), tuple(sorted(interests or ())))
+        cached = self._rec_cache.get(cache_key)
+        if cached is not None:
+            created_at, cached_recs = cached
+            if time.monotonic() - created_at < _REC_CACHE_TTL:
+                self._rec_cache.move_to_end(cache_key)
+                # Per-item copies: consumers annotate the dicts in place,
+                # and shared items would accumulate those edits across hits
+                return [dict(rec) for rec in cached_recs]
+            del self._rec_cache[cache_key]
+
         recommendations = []
-        
+        fetch_succeeded = False
+
         # Try Cultural Discovery Engine first
         cultural_engine = self.get_service('cultural_discovery')
         if cultural_engine and cultural_engine.is_available():
             try:
                 if interests:
-                    # Get recommendations based on user interests
-                    recs = cultural_engine.get_korean_cultural_matches(interests)
-                    recommendations.extend(recs)
-                    
-                    # Also search for query-specific recommendations
-                    query_recs = cultural_engine.find_similar_korean_experiences(query, limit=5)
-                    recommendations.extend(query_recs)
+                    # Interest-based matches and query-specific search are
+                    # independent HTTP calls; issue them concurrently so the
+                    # wait is the slower of the two rather than their sum
+                    matches_future = _executor.submit(
+                        cultural_engine.get_korean_cultural_matches, interests
+                    )
+                    query_future = _executor.submit(
+                        cultural_engine.find_similar_korean_experiences, query, limit=5
+                    )
+                    recommendations.extend(matches_future.result())
+                    recommendations.extend(query_future.result())
                 else:
                     # Just search based on query
                     recs = cultural_engine.find_similar_korean_experiences(query)
                     recommendations.extend(recs)
-                    
+
+                fetch_succeeded = True
+
             except Exception as e:
-                print(f"Cultural Discovery Engine recommendation failed: {e}")
-        
-        # Fallback to TasteDive service if Cultural Discovery Engine failed
-        if not recommendations:
-            tastedive = self.get_service('tastedive')
-            if tastedive and tastedive.is_available():
-                try:
-                    if interests:
-                        recs = tastedive.get_korean_cultural_matches(interests)
-                    else:
-                        recs = tastedive.find_similar_korean_experiences(query)
-                    recommendations.extend(recs)
-                except Exception as e:
-                    print(f"TasteDive recommendation failed: {e}")
+                logger.warning("Cultural Discovery Engine recommendation failed: %s", e)
+                self.mark_unhealthy('cultural_discovery')
         
-        # Final fallback to local cultural knowledge
+        # The legacy 'tastedive' name aliases the same engine instance, so a
+        # second attempt through it cannot succeed where the first failed;
+        # fall straight through to local cultural knowledge
         if not recommendations:
             recommendations = self._get_fallback_cultural_recommendations(query, interests)
         
-        # Remove duplicates and limit results
-        unique_recommendations = self._deduplicate_recommendations(recommendations)
-        return unique_recommendations[:10]  # Limit to top 10
+        # Remove duplicates, stopping once the top-10 budget is filled
+        unique_recommendations = self._deduplicate_recommendations(recommendations, limit=10)
+
+        # Only cache results the engine actually produced; probing breaker
+        # state here would admit fallback output for the first few failures
+        # of an outage, before the breaker opens
+        if fetch_succeeded:
+            self._rec_cache[cache_key] = (time.monotonic(), unique_recommendations)
+            if len(self._rec_cache) > _REC_CACHE_MAX_ENTRIES:
+                self._rec_cache.popitem(last=False)
+
+        # Copy per item so the caller's mutations never reach the cached list
+        return [dict(rec) for rec in unique_recommendations]
     
     def get_culturally_related_experiences(self, visited_place: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -234,57 +422,89 @@ class ServiceManager:
             try:
                 return cultural_engine.find_culturally_related_locations(visited_place)
             except Exception as e:
-                print(f"Cultural relationship discovery failed: {e}")
+                logger.warning("Cultural relationship discovery failed: %s", e)
         
         # Fallback to basic recommendations
         place_name = visited_place.get('name', '')
         return self.get_cultural_recommendations(f"korean culture {place_name}")
     
-    def _deduplicate_recommendations(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate recommendations based on name."""
+    def _deduplicate_recommendations(self, recommendations: List[Dict[str, Any]],
+                                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Remove duplicate recommendations based on name.
+
+        When a limit is given, the scan stops as soon as that many unique
+        entries are collected, so oversized candidate lists are not hashed
+        past the cut-off.
+        """
         seen_names = set()
         unique_recs = []
-        
+
         for rec in recommendations:
-            name = rec.get('Name', rec.get('name', ''))
+            name = rec.get('Name') or rec.get('name')
             if name and name not in seen_names:
                 seen_names.add(name)
                 unique_recs.append(rec)
-        
+                if limit is not None and len(unique_recs) >= limit:
+                    break
+
         return unique_recs
-    
+
+    @staticmethod
+    def _future_has_places(futures) -> bool:
+        """True if any completed future already produced a non-empty result."""
+        for future in futures:
+            if future.done() and not future.cancelled():
+                try:
+                    if future.result():
+                        return True
+                except Exception:
+                    continue
+        return False
+
     def search_places(self, query: str, location: tuple = None, place_type: str = None) -> List[Dict[str, Any]]:
         """
         Search for places using available services with sub-200ms optimization.
-        Falls back to Google Maps if Search service is unavailable.
+
+        The primary Search service gets a short head start; if it has not
+        answered within the hedging delay the Google Maps fallback is fired
+        concurrently and the first non-empty result wins, so a slow primary
+        no longer adds its full latency before the fallback even starts.
         """
-        places = []
-        
+        futures = {}
+
         # Try Search service first for fast search
         search_service = self.get_service('search')
         if search_service and search_service.is_available():
-            try:
-                places = search_service.search_places(query, location, place_type)
-            except Exception as e:
-                print(f"Search service failed: {e}")
-        
-        # Fallback to Algolia service (backward compatibility)
-        if not places:
-            algolia = self.get_service('algolia')
-            if algolia and algolia.is_available():
-                try:
-                    places = algolia.search_places(query, location, place_type)
-                except Exception as e:
-                    print(f"Algolia search failed: {e}")
-        
-        # Fallback to Google Maps if Search services failed
-        if not places:
+            primary = _executor.submit(
+                search_service.search_places, query, location, place_type
+            )
+            futures[primary] = 'Search service'
+            concurrent.futures.wait([primary], timeout=SEARCH_HEDGE_DELAY)
+
+        # The legacy 'algolia' name aliases the same search instance, so a
+        # retry through it is skipped in favour of the Google Maps hedge
+        if not self._future_has_places(futures):
             googlemaps = self.get_service('googlemaps')
             if googlemaps and googlemaps.is_available():
-                try:
-                    places = googlemaps.search_places_by_text(query, location)
-                except Exception as e:
-                    print(f"Google Maps search failed: {e}")
+                futures[_executor.submit(
+                    googlemaps.search_places_by_text, query, location
+                )] = 'Google Maps'
+
+        places = []
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning("%s search failed: %s", name, e)
+                self.mark_unhealthy('search' if name == 'Search service' else 'googlemaps')
+                continue
+            if result:
+                places = result
+                for other in futures:
+                    if other is not future:
+                        other.cancel()
+                break
         
         # Final fallback to local data
         if not places:
@@ -296,93 +516,52 @@ class ServiceManager:
         """
         Generate natural language response using available services.
         """
-        # Try ResponseGenerator first (new implementation)
-        response_generator = self.get_service('response_generator')
-        if response_generator and response_generator.is_available():
-            try:
-                return response_generator.generate_response(question, recommendations, cultural_context)
-            except Exception as e:
-                print(f"Response Generator failed: {e}")
-        
-        # Fallback to Gemini service (legacy compatibility)
-        gemini = self.get_service('gemini')
-        if gemini and gemini.is_available():
+        # Rebuild on first use, and periodically so services sidelined by an
+        # open breaker get re-admitted once their recovery timeout elapses
+        if (self._response_pipeline is None or
+                time.monotonic() - self._pipeline_ts >= _PIPELINE_MAX_AGE):
+            self.refresh_pipeline()
+
+        # ResponseGenerator first (new implementation), then the legacy
+        # Gemini service; the pipeline was already filtered by health
+        for name, generate in self._response_pipeline:
             try:
-                return gemini.generate_local_guide_response(question, recommendations, cultural_context)
+                return generate(question, recommendations, cultural_context)
             except Exception as e:
-                print(f"Gemini response generation failed: {e}")
-        
+                logger.warning("%s response generation failed: %s", name, e)
+                self.mark_unhealthy(name)
+
         # Fallback to structured response
         return self._get_fallback_response(question, recommendations)
     
     def _get_fallback_cultural_recommendations(self, query: str, interests: List[str] = None) -> List[Dict[str, Any]]:
         """Provide fallback cultural recommendations when all services fail."""
-        fallback_recs = [
-            {
-                'Name': 'Korean Traditional Music',
-                'Type': 'music',
-                'wTeaser': 'Experience traditional Korean instruments and melodies'
-            },
-            {
-                'Name': 'Korean Temple Stay',
-                'Type': 'experience',
-                'wTeaser': 'Immerse yourself in Korean Buddhist culture'
-            },
-            {
-                'Name': 'Korean Cooking Class',
-                'Type': 'activity',
-                'wTeaser': 'Learn to prepare authentic Korean dishes'
-            }
-        ]
-        
-        # Filter by interests if provided
+        # Filter by interests if provided, via the precomputed keyword index
         if interests:
-            query_lower = ' '.join(interests).lower()
-            if 'music' in query_lower or 'k-pop' in query_lower:
-                return [r for r in fallback_recs if r['Type'] == 'music']
-            elif 'food' in query_lower or 'cooking' in query_lower:
-                return [r for r in fallback_recs if 'cooking' in r['Name'].lower()]
-        
-        return fallback_recs
+            keywords = {word for interest in interests for word in interest.lower().split()}
+            for keyword in ('music', 'k-pop', 'food', 'cooking'):
+                if keyword in keywords:
+                    return list(_FALLBACK_INDEX[keyword])
+
+        return list(_FALLBACK_CULTURAL_RECS)
     
     def _get_fallback_places(self, query: str, place_type: str = None) -> List[Dict[str, Any]]:
         """Provide fallback place recommendations when all services fail."""
-        fallback_places = [
-            {
-                'name': 'Gyeongbokgung Palace',
-                'category': 'attraction',
-                'location': {'lat': 37.5796, 'lng': 126.9770},
-                'cultural_context': 'Historic royal palace showcasing Korean architecture',
-                'neighborhood': 'jongno'
-            },
-            {
-                'name': 'Bukchon Hanok Village',
-                'category': 'attraction',
-                'location': {'lat': 37.5834, 'lng': 126.9834},
-                'cultural_context': 'Traditional Korean houses and cultural heritage',
-                'neighborhood': 'jongno'
-            },
-            {
-                'name': 'Insadong Cultural Street',
-                'category': 'attraction',
-                'location': {'lat': 37.5759, 'lng': 126.9852},
-                'cultural_context': 'Traditional arts, crafts, and tea culture',
-                'neighborhood': 'jongno'
-            }
-        ]
-        
         if place_type:
-            fallback_places = [p for p in fallback_places if p['category'] == place_type]
-        
-        return fallback_places
+            return [p for p in _FALLBACK_PLACES if p['category'] == place_type]
+
+        return list(_FALLBACK_PLACES)
     
     def _get_fallback_response(self, question: str, recommendations: List[Any]) -> str:
         """Provide structured fallback response when Gemini is unavailable."""
-        if recommendations:
-            rec_names = [str(rec.get('Name', rec)) for rec in recommendations[:3] if rec]
-            rec_text = ', '.join(rec_names)
-            
-            return f"""
+        if not recommendations:
+            return _FALLBACK_RESPONSE_NO_RECS_HTML
+
+        # Stream the handful of names straight into the join; no need for an
+        # intermediate list at this size
+        rec_text = ', '.join(str(rec.get('Name', rec)) for rec in recommendations[:3] if rec)
+
+        return f"""
             <div class="fallback-response">
                 <p>Based on your question about Korean culture, here are some recommendations:</p>
                 <p><strong>{rec_text}</strong></p>
@@ -390,21 +569,17 @@ class ServiceManager:
                 <p><em>For more detailed cultural insights, our AI assistant will be back online shortly.</em></p>
             </div>
             """
-        else:
-            return f"""
-            <div class="fallback-response">
-                <p>Thank you for your interest in Korean culture!</p>
-                <p>While our recommendation system is temporarily unavailable, I'd suggest exploring:</p>
-                <ul>
-                    <li><strong>Hongdae</strong> - Youth culture and nightlife</li>
-                    <li><strong>Myeongdong</strong> - Shopping and street food</li>
-                    <li><strong>Itaewon</strong> - International district</li>
-                    <li><strong>Gangnam</strong> - Modern Korean lifestyle</li>
-                </ul>
-                <p><em>Please try your question again in a moment for personalized recommendations.</em></p>
-            </div>
-            """
 
 
-# Global service manager instance
-service_manager = ServiceManager()
\ No newline at end of file
+# Global service manager instance, created lazily (PEP 562) so importing the
+# module - or anything that transitively imports it - stays cheap
+_service_manager = None
+
+
+def __getattr__(name):
+    global _service_manager
+    if name == 'service_manager':
+        if _service_manager is None:
+            _service_manager = ServiceManager()
+        return _service_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
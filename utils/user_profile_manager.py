@@ -3,11 +3,64 @@ User Profile Manager for Taste & Trails Korea
 Handles user authentication, preferences, and personalization data in MongoDB.
 """
 
+import math
+import time
+import weakref
+
+from collections import Counter
 from datetime import datetime, timedelta
 from bson.objectid import ObjectId
-from passlib.hash import pbkdf2_sha256
-import hashlib
-import json
+from passlib.context import CryptContext
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import OperationFailure
+
+from utils.config import config
+
+# Shared password-hashing context, built once at import: pins the PBKDF2 work
+# factor explicitly instead of floating on the Passlib default (existing
+# hashes verify unchanged since the round count is encoded in each stored
+# hash) and gives a single place to migrate algorithms later via
+# deprecated="auto"
+_PWD_CTX = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__rounds=60000,
+    deprecated="auto"
+)
+
+# Exponential decay rate for recommendation weights: a weight's learned
+# offset halves every 30 days without reinforcing activity, so stale
+# behavior stops dominating recommendations
+_WEIGHT_DECAY_LAMBDA = math.log(2) / 30
+
+# In-process throttle for repeated password failures per username: under
+# credential-stuffing traffic this bounds KDF CPU and failed-attempt writes
+# between attempts without waiting for the persistent 5-attempt lockout
+_FAILURE_WINDOW_SECONDS = 60
+_FAILURE_WINDOW_LIMIT = 10
+_FAILURE_TABLE_MAX_ENTRIES = 1024
+_recent_failures = {}
+
+# External API keys the security validation checks for
+_API_KEY_NAMES = ('TASTEDIVE_API_KEY', 'ALGOLIA_API_KEY', 'GOOGLE_MAPS_API_KEY', 'GEMINI_API_KEY')
+
+# Case-insensitive collation for the email index; lookups passing the same
+# collation hit the index with raw-cased input, and case-variant duplicate
+# registrations are rejected at the index level
+_EMAIL_COLLATION = {"locale": "en", "strength": 2}
+
+# Map place categories to recommendation weight keys
+_CATEGORY_TO_WEIGHT = {
+    "restaurant": "food",
+    "food": "food",
+    "attraction": "culture",
+    "cultural": "culture",
+    "nightlife": "nightlife",
+    "bar": "nightlife",
+    "shopping": "shopping",
+    "mall": "shopping",
+    "nature": "nature",
+    "park": "nature"
+}
 
 
 class UserProfileManager:
@@ -19,30 +72,98 @@ class UserProfileManager:
     - Optimized MongoDB operations for sub-second response times
     """
     
+    # Clients whose indexes have already been ensured; keyed per client so
+    # per-request manager construction over a shared client skips the
+    # createIndex round trips after the first instance
+    _indexed_clients = weakref.WeakSet()
+
     def __init__(self, mongo_client):
         """Initialize the User Profile Manager with MongoDB client."""
         self.db = mongo_client.taste_trails_korea
         self.users = self.db.users
         self.recommendation_cache = self.db.recommendation_cache
-        
-        # Create indexes for performance optimization
-        self._create_indexes()
-    
-    def _create_indexes(self):
-        """Create MongoDB indexes for optimized query performance."""
+
+        # Create indexes for performance optimization, once per client
+        if mongo_client not in UserProfileManager._indexed_clients:
+            self._create_indexes()
+            UserProfileManager._indexed_clients.add(mongo_client)
+
+    @classmethod
+    def from_uri(cls, uri):
+        """
+        Construct a manager backed by a connection-pooled MongoDB client.
+
+        Share the resulting manager (or its underlying client) process-wide;
+        creating one per request defeats the pool and pays the TCP/TLS/auth
+        handshake on every operation.
+
+        Args:
+            uri (str): MongoDB connection URI
+
+        Returns:
+            UserProfileManager: Manager using a tuned client pool
+        """
+        client = MongoClient(
+            uri,
+            maxPoolSize=200,
+            minPoolSize=10,
+            maxIdleTimeMS=300000,
+            waitQueueTimeoutMS=5000,
+            retryWrites=True
+        )
+        return cls(client)
+
+    @staticmethod
+    def _ensure_index(collection, keys, **options):
+        """Create one index, migrating it when its options have changed.
+
+        Deployments created by older code may hold a same-name index with
+        different options (no collation on email, no TTL on expires_at);
+        create_index then raises an options conflict, so drop the old index
+        and recreate it. Each index is handled independently so one failure
+        never skips the rest.
+        """
         try:
-            # User collection indexes
-            self.users.create_index("username", unique=True)
-            self.users.create_index("email", unique=True)
-            self.users.create_index("personalization.last_recommendation_update")
-            
-            # Recommendation cache indexes
-            self.recommendation_cache.create_index("cache_key", unique=True)
-            self.recommendation_cache.create_index("user_id")
-            self.recommendation_cache.create_index("expires_at")
-            
+            collection.create_index(keys, **options)
+        except OperationFailure as e:
+            # 85: IndexOptionsConflict, 86: IndexKeySpecsConflict
+            if e.code not in (85, 86):
+                print(f"Index creation warning: {e}")
+                return
+            try:
+                if isinstance(keys, str):
+                    index_name = options.get("name", f"{keys}_1")
+                else:
+                    index_name = options.get(
+                        "name", "_".join(f"{field}_{direction}" for field, direction in keys)
+                    )
+                collection.drop_index(index_name)
+                collection.create_index(keys, **options)
+            except Exception as migrate_error:
+                print(f"Index migration warning: {migrate_error}")
         except Exception as e:
             print(f"Index creation warning: {e}")
+
+    def _create_indexes(self):
+        """Create MongoDB indexes for optimized query performance."""
+        # User collection indexes
+        self._ensure_index(self.users, "username", unique=True)
+        self._ensure_index(self.users, "email", unique=True, collation=_EMAIL_COLLATION)
+        self._ensure_index(self.users, "personalization.last_recommendation_update")
+
+        # Recommendation cache indexes
+        self._ensure_index(self.recommendation_cache, "cache_key", unique=True)
+        # Compound index covering the exact shape of cache lookups; its
+        # user_id prefix also serves queries on user alone, so no
+        # separate user_id index is needed
+        self._ensure_index(
+            self.recommendation_cache,
+            [("user_id", 1), ("query_type", 1), ("cache_epoch", 1), ("expires_at", 1)],
+            name="cache_lookup"
+        )
+        # TTL index: the server reaps expired entries in the background,
+        # so cleanup_expired_cache no longer needs to run on a schedule
+        self._ensure_index(self.recommendation_cache, "expires_at", expireAfterSeconds=0)
     
     def create_user_profile(self, user_data):
         """
@@ -65,7 +186,7 @@ class UserProfileManager:
         user_profile = {
             "username": user_data["username"],
             "email": user_data["email"].lower(),
-            "password_hash": pbkdf2_sha256.hash(password),
+            "password_hash": _PWD_CTX.hash(password),
             "created_at": now,
             "phone": user_data.get("phone", ""),
             "address": user_data.get("address", ""),
@@ -101,7 +222,8 @@ class UserProfileManager:
                     "nature": 1.0
                 },
                 "preferred_neighborhoods": [],
-                "last_recommendation_update": now
+                "last_recommendation_update": now,
+                "cache_epoch": 0
             }
         }
         
@@ -118,7 +240,7 @@ class UserProfileManager:
             rating (int, optional): User rating 1-5
         """
         now = datetime.utcnow()
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         
         # Create visited place entry
         place_entry = {
@@ -130,20 +252,31 @@ class UserProfileManager:
             "notes": visited_place.get("notes", "")
         }
         
-        # Add to visited places
-        self.users.update_one(
-            {"_id": user_oid},
-            {
-                "$push": {"history.visited_places": place_entry},
-                "$set": {"personalization.last_recommendation_update": now}
-            }
+        # Batch the visit push and the weight updates into a single
+        # bulk_write so the whole event costs one round trip to MongoDB
+        # instead of three
+        operations = [
+            UpdateOne(
+                {"_id": user_oid},
+                {
+                    "$push": {
+                        "history.visited_places": {
+                            "$each": [place_entry],
+                            "$slice": -500  # Keep only the most recent 500 visits
+                        }
+                    },
+                    "$set": {"personalization.last_recommendation_update": now},
+                    "$inc": {"personalization.cache_epoch": 1}
+                }
+            )
+        ]
+        operations.extend(
+            UpdateOne(filter_doc, update_doc)
+            for filter_doc, update_doc in self._weight_update_ops(
+                user_oid, visited_place.get("category"), rating
+            )
         )
-        
-        # Update recommendation weights based on place category
-        self._update_recommendation_weights(user_id, visited_place.get("category"), rating)
-        
-        # Clear recommendation cache for this user
-        self._clear_user_cache(user_id)
+        self.users.bulk_write(operations)
     
     def add_favorite(self, user_id, favorite_place):
         """
@@ -154,7 +287,7 @@ class UserProfileManager:
             favorite_place (dict): Place information
         """
         now = datetime.utcnow()
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         
         favorite_entry = {
             "place_id": favorite_place.get("place_id", ""),
@@ -163,34 +296,42 @@ class UserProfileManager:
             "added_date": now
         }
         
-        # Add to favorites and update recommendation timestamp
-        self.users.update_one(
-            {"_id": user_oid},
-            {
-                "$push": {"history.favorites": favorite_entry},
-                "$set": {"personalization.last_recommendation_update": now}
-            }
+        # Batch the favorite push and the weight updates into one round trip
+        operations = [
+            UpdateOne(
+                {"_id": user_oid},
+                {
+                    "$push": {
+                        "history.favorites": {
+                            "$each": [favorite_entry],
+                            "$slice": -200  # Keep only the most recent 200 favorites
+                        }
+                    },
+                    "$set": {"personalization.last_recommendation_update": now},
+                    "$inc": {"personalization.cache_epoch": 1}
+                }
+            )
+        ]
+        operations.extend(
+            UpdateOne(filter_doc, update_doc)
+            for filter_doc, update_doc in self._weight_update_ops(
+                user_oid, favorite_place.get("category"), 5  # Favorites get high weight
+            )
         )
-        
-        # Update recommendation weights
-        self._update_recommendation_weights(user_id, favorite_place.get("category"), 5)  # Favorites get high weight
-        
-        # Clear recommendation cache
-        self._clear_user_cache(user_id)
+        self.users.bulk_write(operations)
     
     def remove_favorite(self, user_id, place_name):
         """Remove a place from user's favorites."""
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         
         self.users.update_one(
             {"_id": user_oid},
             {
                 "$pull": {"history.favorites": {"name": place_name}},
-                "$set": {"personalization.last_recommendation_update": datetime.utcnow()}
+                "$set": {"personalization.last_recommendation_update": datetime.utcnow()},
+                "$inc": {"personalization.cache_epoch": 1}
             }
         )
-        
-        self._clear_user_cache(user_id)
     
     def update_search_history(self, user_id, query, results_clicked=None):
         """
@@ -201,7 +342,7 @@ class UserProfileManager:
             query (str): Search query
             results_clicked (list): List of clicked result names
         """
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         
         search_entry = {
             "query": query,
@@ -232,9 +373,22 @@ class UserProfileManager:
         Returns:
             dict: Personalized preferences and weights
         """
-        user_oid = ObjectId(user_id)
-        user = self.users.find_one({"_id": user_oid})
-        
+        user_oid = self._coerce_oid(user_id)
+
+        # Fetch only the fields this summary needs: the projection trims
+        # each visited place down to its neighborhood and each favorite to
+        # its place_id, so search history, notes and the rest of the
+        # document never cross the wire
+        user = self.users.find_one(
+            {"_id": user_oid},
+            {
+                "preferences": 1,
+                "personalization.recommendation_weights": 1,
+                "history.visited_places.location.neighborhood": 1,
+                "history.favorites.place_id": 1
+            }
+        )
+
         if not user:
             return None
         
@@ -248,19 +402,18 @@ class UserProfileManager:
             "food": 1.0, "culture": 1.0, "nightlife": 1.0, "shopping": 1.0, "nature": 1.0
         })
         
-        # Analyze visited places to infer preferred neighborhoods
+        # Analyze visited places to infer preferred neighborhoods; Counter
+        # tallies in C and most_common uses a partial sort for the top 3
         visited_places = history.get("visited_places", [])
-        neighborhood_counts = {}
-        
-        for place in visited_places:
-            location = place.get("location", {})
-            neighborhood = location.get("neighborhood")
-            if neighborhood:
-                neighborhood_counts[neighborhood] = neighborhood_counts.get(neighborhood, 0) + 1
-        
+        neighborhood_counts = Counter(
+            place.get("location", {}).get("neighborhood") for place in visited_places
+        )
+        neighborhood_counts.pop(None, None)
+
         # Update preferred neighborhoods based on visit frequency
-        preferred_neighborhoods = sorted(neighborhood_counts.keys(), 
-                                       key=lambda x: neighborhood_counts[x], reverse=True)[:3]
+        preferred_neighborhoods = [
+            neighborhood for neighborhood, _ in neighborhood_counts.most_common(3)
+        ]
         
         return {
             "preferences": preferences,
@@ -280,7 +433,7 @@ class UserProfileManager:
             user_id (str): User's ObjectId as string
             new_preferences (dict): Updated preference data
         """
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         now = datetime.utcnow()
         
         # Update preferences
@@ -293,85 +446,156 @@ class UserProfileManager:
             if key in ["food_restrictions", "interests", "cultural_preferences", "budget_range", "travel_style"]:
                 update_data[f"preferences.{key}"] = value
         
+        # The epoch bump invalidates cached recommendations in the same
+        # write, forcing an immediate update
         self.users.update_one(
             {"_id": user_oid},
-            {"$set": update_data}
+            {"$set": update_data, "$inc": {"personalization.cache_epoch": 1}}
         )
-        
-        # Clear recommendation cache to force immediate update
-        self._clear_user_cache(user_id)
     
-    def _update_recommendation_weights(self, user_id, category, rating):
+    @staticmethod
+    def _coerce_oid(user_id):
+        """Return user_id as an ObjectId, parsing only when given a string.
+
+        Request paths pass the same id through several helpers; accepting an
+        already-parsed ObjectId avoids re-validating the hex string on every
+        hop.
         """
-        Update recommendation weights based on user activity.
-        
+        if isinstance(user_id, ObjectId):
+            return user_id
+        return ObjectId(user_id)
+
+    def _weight_update_ops(self, user_oid, category, rating):
+        """
+        Build the (filter, update) pairs that adjust recommendation weights.
+
+        Returned pairs feed either individual update_one calls or a combined
+        bulk_write alongside other operations on the users collection.
+
         Args:
-            user_id (str): User's ObjectId as string
+            user_oid (ObjectId): User's ObjectId
             category (str): Place category (food, culture, nightlife, etc.)
             rating (int): User rating or implicit rating
+
+        Returns:
+            list: (filter, update) tuples, empty if no adjustment applies
         """
         if not category or not rating:
-            return
-        
-        user_oid = ObjectId(user_id)
-        
-        # Map categories to weight keys
-        category_mapping = {
-            "restaurant": "food",
-            "food": "food",
-            "attraction": "culture",
-            "cultural": "culture",
-            "nightlife": "nightlife",
-            "bar": "nightlife",
-            "shopping": "shopping",
-            "mall": "shopping",
-            "nature": "nature",
-            "park": "nature"
-        }
-        
-        weight_key = category_mapping.get(category.lower())
+            return []
+
+        weight_key = _CATEGORY_TO_WEIGHT.get(category.lower())
         if not weight_key:
-            return
-        
+            return []
+
         # Calculate weight adjustment based on rating
         adjustment = (rating - 3) * 0.1  # -0.2 to +0.2 adjustment
-        
-        # Update the specific weight
-        self.users.update_one(
-            {"_id": user_oid},
-            {
-                "$inc": {f"personalization.recommendation_weights.{weight_key}": adjustment},
-                "$set": {"personalization.last_recommendation_update": datetime.utcnow()}
-            }
-        )
-        
-        # Ensure weights stay within reasonable bounds (0.1 to 2.0)
-        user = self.users.find_one({"_id": user_oid})
-        if user:
-            weights = user.get("personalization", {}).get("recommendation_weights", {})
-            updated_weights = {}
-            
-            for key, value in weights.items():
-                updated_weights[key] = max(0.1, min(2.0, value))
-            
-            self.users.update_one(
+
+        weight_field = f"personalization.recommendation_weights.{weight_key}"
+
+        # Decay the stored weight toward neutral based on days since the
+        # last update, apply the new adjustment, then clamp to reasonable
+        # bounds (0.1 to 2.0) — all server side in one aggregation-pipeline
+        # update, so there is no read-modify-write race and no extra round
+        # trip. Expressions in a $set stage read the pre-stage document, so
+        # the decay sees the old timestamp while $$NOW refreshes it.
+        days_since_update = {
+            "$divide": [
+                {"$subtract": [
+                    "$$NOW",
+                    {"$ifNull": ["$personalization.last_recommendation_update", "$$NOW"]}
+                ]},
+                86400000.0  # milliseconds per day
+            ]
+        }
+        decayed_weight = {
+            "$multiply": [
+                {"$ifNull": [f"${weight_field}", 1.0]},
+                {"$exp": {"$multiply": [-_WEIGHT_DECAY_LAMBDA, days_since_update]}}
+            ]
+        }
+        return [
+            (
                 {"_id": user_oid},
-                {"$set": {"personalization.recommendation_weights": updated_weights}}
+                [{
+                    "$set": {
+                        weight_field: {
+                            "$max": [0.1, {"$min": [2.0, {"$add": [decayed_weight, adjustment]}]}]
+                        },
+                        "personalization.last_recommendation_update": "$$NOW"
+                    }
+                }]
             )
+        ]
+
+    def _update_recommendation_weights(self, user_id, category, rating):
+        """
+        Update recommendation weights based on user activity.
+
+        Args:
+            user_id (str): User's ObjectId as string
+            category (str): Place category (food, culture, nightlife, etc.)
+            rating (int): User rating or implicit rating
+        """
+        for filter_doc, update_doc in self._weight_update_ops(self._coerce_oid(user_id), category, rating):
+            self.users.update_one(filter_doc, update_doc)
     
     def _clear_user_cache(self, user_id):
-        """Clear recommendation cache for a specific user."""
-        user_oid = ObjectId(user_id)
-        self.recommendation_cache.delete_many({"user_id": user_oid})
+        """
+        Invalidate all cached recommendations for a user.
+
+        Bumps the user's cache epoch rather than deleting cache documents;
+        entries written under an older epoch no longer match lookups and are
+        reaped by the TTL index. Profile-update paths fold the same epoch
+        bump into their own writes, so this is for callers invalidating
+        outside those flows.
+        """
+        user_oid = self._coerce_oid(user_id)
+        self.users.update_one(
+            {"_id": user_oid},
+            {"$inc": {"personalization.cache_epoch": 1}}
+        )
+
+    def _get_cache_epoch(self, user_oid):
+        """Fetch the user's current cache epoch with a minimal projection."""
+        user = self.users.find_one(
+            {"_id": user_oid},
+            {"personalization.cache_epoch": 1}
+        )
+        if not user:
+            return 0
+        return user.get("personalization", {}).get("cache_epoch", 0)
     
     def get_user_by_id(self, user_id):
         """Get user by ObjectId with optimized query."""
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         return self.users.find_one({"_id": user_oid})
     
     def get_user_by_username(self, username):
         """Get user by username with optimized query."""
         return self.users.find_one({"username": username})
+
+    def get_user_by_email(self, email):
+        """Get user by email, matching case-insensitively via the index collation."""
+        return self.users.find_one({"email": email}, collation=_EMAIL_COLLATION)
+
+    def get_user_for_login(self, username):
+        """
+        Get only the fields the login path needs.
+
+        Full user documents carry history arrays that can reach tens of KB;
+        authentication needs just the credentials and lockout state, so this
+        projection keeps the most frequent query small. Callers wanting the
+        full profile should use get_user_by_id after authenticating.
+        """
+        return self.users.find_one(
+            {"username": username},
+            {
+                "username": 1,
+                "password_hash": 1,
+                "failed_login_attempts": 1,
+                "account_locked_until": 1
+            }
+        )
     
     def verify_password(self, user, password):
         """
@@ -399,10 +623,24 @@ class UserProfileManager:
                     }
                 )
         
+        # No stored hash means nothing can match — skip the expensive KDF
+        if not user.get("password_hash"):
+            return False
+
+        # Throttle hammered usernames before paying for the KDF
+        username = user.get("username")
+        now_ts = time.monotonic()
+        window_start, failure_count = _recent_failures.get(username, (now_ts, 0))
+        if now_ts - window_start >= _FAILURE_WINDOW_SECONDS:
+            window_start, failure_count = now_ts, 0
+        if failure_count >= _FAILURE_WINDOW_LIMIT:
+            return False
+
         # Verify password
-        is_valid = pbkdf2_sha256.verify(password, user["password_hash"])
+        is_valid = _PWD_CTX.verify(password, user["password_hash"])
         
         if is_valid:
+            _recent_failures.pop(username, None)
             # Reset failed attempts and update last login
             self.users.update_one(
                 {'_id': user['_id']},
@@ -416,6 +654,14 @@ class UserProfileManager:
             )
             return True
         else:
+            # Record the in-process failure, pruning stale windows if the
+            # table has grown large
+            if len(_recent_failures) >= _FAILURE_TABLE_MAX_ENTRIES:
+                cutoff = now_ts - _FAILURE_WINDOW_SECONDS
+                for name in [n for n, (start, _) in _recent_failures.items() if start < cutoff]:
+                    del _recent_failures[name]
+            _recent_failures[username] = (window_start, failure_count + 1)
+
             # Increment failed attempts
             failed_attempts = user.get('failed_login_attempts', 0) + 1
             update_data = {'failed_login_attempts': failed_attempts}
@@ -440,26 +686,32 @@ class UserProfileManager:
             recommendations (list): List of recommendations
             cache_duration_hours (int): Cache duration in hours
         """
-        user_oid = ObjectId(user_id)
-        now = datetime.utcnow()
-        
-        # Create cache key
-        cache_key = hashlib.md5(f"{user_id}_{query_type}_{json.dumps(recommendations, sort_keys=True)}".encode()).hexdigest()
-        
-        cache_entry = {
-            "cache_key": cache_key,
-            "user_id": user_oid,
-            "query_type": query_type,
-            "recommendations": recommendations,
-            "created_at": now,
-            "expires_at": datetime.utcnow().replace(hour=now.hour + cache_duration_hours),
-            "hit_count": 0
-        }
-        
-        # Upsert cache entry
-        self.recommendation_cache.replace_one(
+        user_oid = self._coerce_oid(user_id)
+        epoch = self._get_cache_epoch(user_oid)
+
+        # Create cache key. Lookups match on (user_id, query_type, epoch),
+        # so the key never needs to depend on the payload; keying on that
+        # tuple alone skips serializing and hashing the whole recommendation
+        # list, and lets the upsert below replace the stale entry instead of
+        # piling up one document per distinct result set
+        cache_key = f"{user_id}:{query_type}:{epoch}"
+
+        # Pipeline upsert: refreshing an entry keeps its accumulated
+        # hit_count instead of resetting it, and $$NOW stamps the timestamps
+        # server side
+        self.recommendation_cache.update_one(
             {"cache_key": cache_key},
-            cache_entry,
+            [{
+                "$set": {
+                    "user_id": user_oid,
+                    "query_type": query_type,
+                    "cache_epoch": epoch,
+                    "recommendations": recommendations,
+                    "created_at": "$$NOW",
+                    "expires_at": {"$add": ["$$NOW", cache_duration_hours * 3600 * 1000]},
+                    "hit_count": {"$ifNull": ["$hit_count", 0]}
+                }
+            }],
             upsert=True
         )
     
@@ -474,23 +726,26 @@ class UserProfileManager:
         Returns:
             list or None: Cached recommendations or None if not found/expired
         """
-        user_oid = ObjectId(user_id)
+        user_oid = self._coerce_oid(user_id)
         now = datetime.utcnow()
         
-        cache_entry = self.recommendation_cache.find_one({
-            "user_id": user_oid,
-            "query_type": query_type,
-            "expires_at": {"$gt": now}
-        })
-        
+        # One round trip: match, bump the hit count and fetch the payload
+        # in a single find_one_and_update instead of a find_one followed by
+        # an update_one
+        cache_entry = self.recommendation_cache.find_one_and_update(
+            {
+                "user_id": user_oid,
+                "query_type": query_type,
+                "cache_epoch": self._get_cache_epoch(user_oid),
+                "expires_at": {"$gt": now}
+            },
+            {"$inc": {"hit_count": 1}},
+            projection={"recommendations": 1}
+        )
+
         if cache_entry:
-            # Increment hit count
-            self.recommendation_cache.update_one(
-                {"_id": cache_entry["_id"]},
-                {"$inc": {"hit_count": 1}}
-            )
             return cache_entry["recommendations"]
-        
+
         return None
     
     def cleanup_expired_cache(self):
@@ -510,7 +765,6 @@ class UserProfileManager:
         warnings = []
         
         # Check if using default secret key
-        from utils.config import config
         secret_key = config.get('SECRET_KEY')
         if secret_key == 'dev_secret_change_in_production':
             issues.append("Using default SECRET_KEY - change for production")
@@ -523,12 +777,8 @@ class UserProfileManager:
             warnings.append("Using localhost MongoDB in non-development environment")
         
         # Check API key configuration
-        api_keys = ['TASTEDIVE_API_KEY', 'ALGOLIA_API_KEY', 'GOOGLE_MAPS_API_KEY', 'GEMINI_API_KEY']
-        missing_keys = []
-        for key in api_keys:
-            if not config.get(key):
-                missing_keys.append(key)
-        
+        missing_keys = [key for key in _API_KEY_NAMES if not config.get(key)]
+
         if missing_keys:
             warnings.append(f"Missing API keys: {', '.join(missing_keys)}")
         